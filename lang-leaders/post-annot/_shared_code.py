@@ -1,3 +1,13 @@
+import functools
+from xml.sax.saxutils import escape as ESC
+
+
+@functools.lru_cache(maxsize=1024)
+def esc_annotator_and_date(annotator, date):
+    r'''Return (annotator, date) as escaped HTML strings, for MWE occurrence tooltips.'''
+    return ESC(annotator or "<unknown>"), ESC(str(date or "<unknown-date>"))
+
+
 def html_header():
     r'''Get HTML header including JS script URLs.'''
     return '''
@@ -50,15 +50,15 @@ class Main:
             mwes1 = tuple(s1.mweoccurs)
             mwes2 = tuple(s2.mweoccurs)
             if not mwes1 and not mwes2:
-                print('<div class="sent-block">')
-                print(' <div class="sent-header sent-header-no-annotations">Sentence #{}</div>'.format(sent_no))
-                print(' <div class="mweoccur-block-list list-group"></div>')
-                print('</div>')  # sent-block
+                sys.stdout.write('<div class="sent-block">\n'
+                                 ' <div class="sent-header sent-header-no-annotations">Sentence #{}</div>\n'
+                                 ' <div class="mweoccur-block-list list-group"></div>\n'
+                                 '</div>\n'.format(sent_no))  # sent-block
                 continue
 
-            print('<div class="sent-block">')
-            print(' <div class="sent-header">Sentence #{}</div>'.format(sent_no))
-            print(' <div class="mweoccur-block-list list-group">')
+            sys.stdout.write('<div class="sent-block">\n'
+                             ' <div class="sent-header">Sentence #{}</div>\n'
+                             ' <div class="mweoccur-block-list list-group">\n'.format(sent_no))
 
             mwe_perfect_pairs, mwes1, mwes2 = self.extract_perfect_pairs(mwes1, mwes2)
             mwe_subset_pairs, mwes1, mwes2 = self.extract_subset_pairs(mwes1, mwes2)
@@ -66,8 +66,8 @@ class Main:
             self.print_single_annotator(2, mwes2)
             self.print_subset_pairs(mwe_subset_pairs)
             self.print_perfect_pairs(mwe_perfect_pairs)
-            print(' </div>')  # mweoccur-block-list
-            print('</div>')  # sent-block
+            sys.stdout.write(' </div>\n'  # mweoccur-block-list
+                             '</div>\n')  # sent-block
 
         print(HTML_FOOTER)
 
@@ -135,10 +135,11 @@ class Main:
         | A2: [ID] I *had* *a* *bath* yesterday .
         '''
         if any(m.category not in dataalign.Categories.NON_MWES for m in [mwe1, mwe2]):
-            self.print_mweoccur_block_header(errortype)
-            self._print_mweo_of_annotator(mwe1, 1)
-            self._print_mweo_of_annotator(mwe2, 2)
-            self.print_mweoccur_block_footer()
+            sys.stdout.write("".join([  # (one write per MWE block)
+                self.mweoccur_block_header(errortype),
+                self._mweo_of_annotator_html(mwe1, 1),
+                self._mweo_of_annotator_html(mwe2, 2),
+                self.mweoccur_block_footer()]))
 
 
     def print_single_annotator(self, annotator_number, mwes):
@@ -148,43 +149,47 @@ class Main:
         '''
         for mwe in mwes:
             if mwe.category not in dataalign.Categories.NON_MWES:
-                self.print_mweoccur_block_header('SINGLE')
-                self._print_mweo_of_annotator(mwe, annotator_number)
-                self.print_mweoccur_block_footer()
+                sys.stdout.write("".join([  # (one write per MWE block)
+                    self.mweoccur_block_header('SINGLE'),
+                    self._mweo_of_annotator_html(mwe, annotator_number),
+                    self.mweoccur_block_footer()]))
 
-    def print_mweoccur_block_header(self, errortype):
+    def mweoccur_block_header(self, errortype):
         msg = {
             'SINGLE':  'PROBLEM: Single annotator',
             'SUBSET':  'PROBLEM: Different annotation spans',
             'LABEL':   'PROBLEM: Conflicting labels',
             'PERFECT': 'Perfect match',
         }[errortype]
-        print('  <div class="mweoccur-block list-group-item">')
-        print('  <button type="button" class="mweoccur-collapse-button mweoccur-collapse-button-problem-{} btn btn-default btn-sm">'.format(errortype))
-        print('    <span class="mweoccur-glyph-up glyphicon glyphicon-collapse-up"></span>')
-        print('    <span class="mweoccur-glyph-down glyphicon glyphicon-collapse-down" style="display:none"></span>')
-        print('    <span class="mweoccur-errortype">{}</span>'.format(msg))
-        print('  </button>')
-        print('  <span class="mweoccur-hideable-part">')
-        print('  <button type="button" class="mweoccur-decide-button btn btn-default btn-sm">DECIDE</button>')
-
-    def print_mweoccur_block_footer(self):
-        print('  </span>')  # hideable-part
-        print('  </div>')  # mweoccur-block
-
-
-    def _print_mweo_of_annotator(self, mweo, annot_number):
-        r'''Print an MWE for given annotator number; e.g.:
+        return ('  <div class="mweoccur-block list-group-item">\n'
+                '  <button type="button" class="mweoccur-collapse-button mweoccur-collapse-button-problem-{} btn btn-default btn-sm">\n'
+                '    <span class="mweoccur-glyph-up glyphicon glyphicon-collapse-up"></span>\n'
+                '    <span class="mweoccur-glyph-down glyphicon glyphicon-collapse-down" style="display:none"></span>\n'
+                '    <span class="mweoccur-errortype">{}</span>\n'
+                '  </button>\n'
+                '  <span class="mweoccur-hideable-part">\n'
+                '  <button type="button" class="mweoccur-decide-button btn btn-default btn-sm">DECIDE</button>\n'
+                ).format(errortype, msg)
+
+    def mweoccur_block_footer(self):
+        return ('  </span>\n'  # hideable-part
+                '  </div>\n')  # mweoccur-block
+
+
+    def _mweo_of_annotator_html(self, mweo, annot_number):
+        r'''Return the HTML for an MWE for given annotator number; e.g.:
         | A2: [ID] I *had* *a* *bath* yesterday .
         '''
-        if mweo is not None:
-            mweo_id = (self.fname2id[mweo.sentence.file_path], mweo.sentence.nth_sent, mweo.indexes)
-            print('   <div class="mweoccur-of-annotator annotator-{}">'.format(annot_number))
-            # Print mweoccur-perAnnotator-id; e.g. ["Foo.xml", 123, [5,7,8]]
-            print('   <span class="mweoccur-perAnnotator-id">{}</span>'.format(ESC(json.dumps(mweo_id))))
-            print('   <span class="mweo-annotator-name">A{}:</span>'.format(annot_number))
-            print("".join(self._occur2html(mweo)))
-            print('   </div>')  # mweoccur-of-annotator
+        if mweo is None:
+            return ''
+        mweo_id = (self.fname2id[mweo.sentence.file_path], mweo.sentence.nth_sent, mweo.indexes)
+        return ('   <div class="mweoccur-of-annotator annotator-{}">\n'
+                # Print mweoccur-perAnnotator-id; e.g. ["Foo.xml", 123, [5,7,8]]
+                '   <span class="mweoccur-perAnnotator-id">{}</span>\n'
+                '   <span class="mweo-annotator-name">A{}:</span>\n'
+                '{}\n'
+                '   </div>\n'  # mweoccur-of-annotator
+                ).format(annot_number, ESC(json.dumps(mweo_id)), annot_number, "".join(self._occur2html(mweo)))
 
 
     def _occur2html(self, occur):
@@ -199,7 +204,7 @@ class Main:
         else:  # occur.category != "Skipped":
             file_info = 'Annotated in file &quot;{}&quot;, sentence #{}, by &quot;{}&quot; on {}'.format(
                     ESC(occur.sentence.file_path), ESC(str(occur.sentence.nth_sent)),
-                    ESC(occur.metadata.annotator or "<unknown>"), ESC(str(occur.metadata.datetime or "<unknown-date>")))
+                    *_shared_code.esc_annotator_and_date(occur.metadata.annotator, occur.metadata.datetime))
         confidence_info = '' if occur.metadata.confidence is None else ' {}%'.format(int(occur.metadata.confidence*100))
         css_mwe_label = dataalign.Categories.css_name(occur.category)
         yield '<span class="label mwe-label {css_mwe_label}"' \
@@ -207,15 +212,18 @@ class Main:
               .format(css_mwe_label=css_mwe_label, title=file_info,
                       mwe_label=ESC(occur.category), confidence_info=confidence_info)
 
-        indexes = set(occur.indexes)
+        sentence = occur.sentence
+        in_mwe = bytearray(len(sentence.tokens))  # in_mwe[i] == 1 iff token i is in the MWE
+        for i in occur.indexes:
+            in_mwe[i] = 1
         yield '<span class="mweoccur-sentence">'
-        for i, t in enumerate(occur.sentence.tokens):
-            if i in indexes:
+        for t, surface, nsp, t_in_mwe in zip(sentence.tokens, sentence.surfaces, sentence.nsps, in_mwe):
+            if t_in_mwe:
                 posinfo = '' if (not t.univ_pos) else ' title="{}/{}"'.format(t.get('LEMMA', '??'), t.univ_pos)
-                yield '<span class="mwe-elem" data-toggle="tooltip"{}>{}</span>'.format(posinfo, ESC(t.surface))
+                yield '<span class="mwe-elem" data-toggle="tooltip"{}>{}</span>'.format(posinfo, ESC(surface))
             else:
-                yield t.surface
-            yield "" if t.nsp else " "
+                yield surface
+            yield "" if nsp else " "
         yield '</span>'
 
         for comment in occur.metadata.nested:
@@ -242,7 +250,7 @@ class VerbInfoCalculator:
         self._find_skipped(sentences_to_discover_skipped)
 
         self.verb2info = collections.defaultdict(VerbInfo)  # type: dict[str, VerbInfo]
-        self.noun2mwes = dict(self._noun2mwes())            # type: dict[str, list[MWELexicalItem]]
+        self.noun2mwes = self._noun2mwes()                  # type: dict[str, list[MWELexicalItem]]
         self.all_nounbased_mwes = set()                     # type: set[MWELexicalItem]
 
         # Update verb2info with noun-based canonics
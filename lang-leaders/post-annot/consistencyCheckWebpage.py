@@ -3,6 +3,7 @@
 import datetime
 import argparse
 import collections
+import functools
 import json
 from xml.sax.saxutils import escape as ESC
 
@@ -41,6 +42,7 @@ class Main:
         self.mwe_mixed = []  # type: list[MWELexicalItem]
         self.mwe_nvmwe = []  # type: list[MWELexicalItem]
         self.fname2id = {fname: i+1 for (i, fname) in enumerate(self.args.input)}
+        self.sent2htmlinfo = {}  # type: dict[dataalign.Sentence, tuple[str, str]]
         if not self.args.find_skipped and self.args.skipped_finding_method:
             exit("ERROR: Option --skipped-finding-method requires --find-skipped")
         self.args.skipped_finding_method = self.args.skipped_finding_method or [DEFAULT_METH]
@@ -94,32 +96,31 @@ class Main:
         | [LVC] I *had* a *bath* yesterday
         | [LVC] When will you *have* a *bath*?
         """
-        print(' <div class="mwe-entry list-group-item">')
+        out = [' <div class="mwe-entry list-group-item">\n']  # (written with a single call at the end)
 
         # Print MWE; e.g. "kick the bucket"
         tooltip = 'Sorted by verb &quot;{}&quot'.format(ESC(head))
         if subhead: tooltip += ' and grouped by noun &quot;{}&quot;'.format(ESC(subhead))
-        print('  <a class="mwe-canonic" data-toggle="tooltip" title="{title}">{canonic}</a>'.format(
+        out.append('  <a class="mwe-canonic" data-toggle="tooltip" title="{title}">{canonic}</a>\n'.format(
                 canonic=ESC(" ".join(mwe.canonicform)), title=tooltip))
 
         # Print labels; e.g. [VID (5) LVC(3)]
-        counter = collections.Counter(o.category for o in mwe.mweoccurs)
-        print('<span class="mwe-label-header">')
-        print('  ' + ' '.join('<span class="label mwe-label {css_mwe_label}">{mwe} ({n})</span>' \
-                .format(css_mwe_label=dataalign.Categories.css_name(mwe), mwe=ESC(mwe), n=n)
-                for (mwe, n) in counter.most_common()))
-        print('</span>')
+        counter = mwe.category_counter
+        out.append('<span class="mwe-label-header">\n')
+        out.append('  ' + ' '.join(_label_span(mwe, n) for (mwe, n) in counter.most_common()) + '\n')
+        out.append('</span>\n')
 
         # Print examples
-        print('  <div class="mwe-occurs">')
+        out.append('  <div class="mwe-occurs">\n')
         for mweoccur, mweo_id in self._iter_mweoccur_and_id(mwe.mweoccurs):
-            print('   <div class="mwe-occur">')
+            out.append('   <div class="mwe-occur">\n')
             # Print mwe-occur-id; e.g. ["Foo.xml", 123, [5,7,8]]
-            print('   <span class="mwe-occur-id">{}</span>'.format(ESC(json.dumps(mweo_id))))
-            print("".join(self._occur2html(mweoccur)))
-            print('   </div>')
-        print('  </div>')  # mwe-occurs
-        print(' </div>')   # mwe-entry
+            out.append('   <span class="mwe-occur-id">{}</span>\n'.format(ESC(json.dumps(mweo_id))))
+            out.extend(self._occur2html(mweoccur))
+            out.append('\n   </div>\n')
+        out.append('  </div>\n')  # mwe-occurs
+        out.append(' </div>\n')   # mwe-entry
+        sys.stdout.write("".join(out))
 
 
     def _occur2html(self, occur):
@@ -127,17 +128,15 @@ class Main:
         | [LVC] I *had* a *bath* yesterday
         | | Some comment typed by an annotator.
         """
-        # Modified by Carlos on Feb 24, 2020: add sentence ID in addition to sentence number
-        sent_id_kvpair = occur.sentence.get_kvpair("sent_id",occur.sentence.get_kvpair("source_sent_id",None))
-        sent_pos_id = "sentence #{}{}".format(ESC(str(occur.sentence.nth_sent))," (ID: {})".format(ESC(sent_id_kvpair.value.split()[-1])) if sent_id_kvpair else "")
+        esc_file_path, sent_pos_id = self._sentence_htmlinfo(occur.sentence)
         # Yield a label; e.g. [LVC]  -- the label contains a tooltip
         if occur.category == "Skipped":
             file_info = 'Possible MWE seen in file &quot;{}&quot;, {}'.format(
-                ESC(occur.sentence.file_path), sent_pos_id)
+                esc_file_path, sent_pos_id)
         else:  # occur.category != "Skipped":
             file_info = 'Annotated in file &quot;{}&quot;, {}, by &quot;{}&quot; on {}'.format(
-                    ESC(occur.sentence.file_path), sent_pos_id,
-                    ESC(occur.metadata.annotator or "<unknown>"), ESC(str(occur.metadata.datetime or "<unknown-date>")))
+                    esc_file_path, sent_pos_id,
+                    *_shared_code.esc_annotator_and_date(occur.metadata.annotator, occur.metadata.datetime))
         confidence_info = '' if occur.metadata.confidence is None else ' {}%'.format(int(occur.metadata.confidence*100))
         css_mwe_label = dataalign.Categories.css_name(occur.category)
         yield '<span class="label mwe-label {css_mwe_label}"' \
@@ -145,15 +144,18 @@ class Main:
               .format(css_mwe_label=css_mwe_label, title=file_info,
                       mwe_label=ESC(occur.category), confidence_info=confidence_info)
 
-        indexes = set(occur.indexes)
+        sentence = occur.sentence
+        in_mwe = bytearray(len(sentence.tokens))  # in_mwe[i] == 1 iff token i is in the MWE
+        for i in occur.indexes:
+            in_mwe[i] = 1
         yield '<span class="mwe-occur-sentence">'
-        for i, t in enumerate(occur.sentence.tokens):
-            if i in indexes:
+        for t, surface, nsp, t_in_mwe in zip(sentence.tokens, sentence.surfaces, sentence.nsps, in_mwe):
+            if t_in_mwe:
                 posinfo = '' if (not t.univ_pos) else ' title="{}/{}"'.format(t.get('LEMMA', '??'), t.univ_pos)
-                yield '<span class="mwe-elem" data-toggle="tooltip"{}>{}</span>'.format(posinfo, ESC(t.surface))
+                yield '<span class="mwe-elem" data-toggle="tooltip"{}>{}</span>'.format(posinfo, ESC(surface))
             else:
-                yield t.surface
-            yield "" if t.nsp else " "
+                yield surface
+            yield "" if nsp else " "
         yield '</span>'
 
         yield ' <span class="mweoccur-decide-button"><span class="glyphicon glyphicon-edit"></span><span class="mwe-glyphtext"></span></span>'
@@ -163,6 +165,18 @@ class Main:
             yield '<div class="mwe-occur-comment">{}</div>'.format(c)
 
 
+    def _sentence_htmlinfo(self, sentence):
+        r"""Return (escaped file path, sentence position info) for `sentence`
+        (cached, as the same sentence is printed once per MWE occurrence)."""
+        ret = self.sent2htmlinfo.get(sentence)
+        if ret is None:
+            # Modified by Carlos on Feb 24, 2020: add sentence ID in addition to sentence number
+            sent_id_kvpair = sentence.get_kvpair("sent_id",sentence.get_kvpair("source_sent_id",None))
+            sent_pos_id = "sentence #{}{}".format(ESC(str(sentence.nth_sent))," (ID: {})".format(ESC(sent_id_kvpair.value.split()[-1])) if sent_id_kvpair else "")
+            ret = self.sent2htmlinfo[sentence] = (ESC(sentence.file_path), sent_pos_id)
+        return ret
+
+
     def _iter_mweoccur_and_id(self, mweoccurs):
         r'''Yield pairs (MWEOccur, id), where `id` is a (int, int, list[int])'''
         ret = []
@@ -182,7 +196,7 @@ class VerbInfoCalculator:
         self._find_skipped(sentences_to_discover_skipped)
 
         self.verb2info = collections.defaultdict(VerbInfo)  # type: dict[str, VerbInfo]
-        self.noun2mwes = dict(self._noun2mwes())            # type: dict[str, list[MWELexicalItem]]
+        self.noun2mwes = self._noun2mwes()                  # type: dict[str, list[MWELexicalItem]]
         self.all_nounbased_mwes = set()                     # type: set[MWELexicalItem]
 
         # Update verb2info with noun-based canonics
@@ -379,6 +393,13 @@ HTML_HEADER_3 = """
 """
 
 
+@functools.lru_cache(maxsize=None)
+def _label_span(mwe, n):
+    r'''Return the HTML label for category `mwe` seen `n` times; e.g. [LVC (3)].'''
+    return '<span class="label mwe-label {css_mwe_label}">{mwe} ({n})</span>' \
+            .format(css_mwe_label=dataalign.Categories.css_name(mwe), mwe=ESC(mwe), n=n)
+
+
 def mwe_dropdown_items(list_of_pairs):
     return '\n'.join(
             '''<li role="presentation"><a role="menuitem" tabindex="-1"'''\
@@ -3,10 +3,9 @@
 import argparse
 import collections
 import datetime
-import json
 import os
 import re
-import subprocess
+import shutil
 import sys
 import pdb
 
@@ -15,6 +14,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lib"))
 import dataalign
 from dataalign import folia
 
+try:
+    from orjson import loads as json_loads  # Optional: faster JSON parsing (same output as json.loads)
+except ImportError:
+    from json import loads as json_loads
+
 
 parser = argparse.ArgumentParser(description="""
         Read JSON notes and output a pretty page that indicates what should be (re-)annotated.""")
@@ -81,6 +85,7 @@ class Main(object):
 
         self.fname2foliadoc = {}
         self.basefname2fname = {}
+        self.corpus_fname2id2sent = {}  # corpus filename -> {sent_id: Sentence} (see `corpus_id2sent`)
         if self.args.corpus_input:      
             self.fname2foliadoc = {fname: dataalign.IterAlignedFiles(lang="EN",file_paths=[fname],keep_nvmwes=True) for fname in self.args.corpus_input}
             self.basefname2fname = {os.path.basename(fname): fname for fname in self.fname2foliadoc}
@@ -99,8 +104,8 @@ class Main(object):
             if self.n_auto == 0:
                 dataalign.do_warn('Zero annotations were done automatically. Not generating corpus.', error=True)  
             else:
-                subprocess.check_call("rm -rf ./AfterAutoUpdate", shell=True)
-                subprocess.check_call("mkdir -p ./AfterAutoUpdate", shell=True)
+                shutil.rmtree("./AfterAutoUpdate", ignore_errors=True)
+                os.makedirs("./AfterAutoUpdate")
                 for fname, foliadoc in sorted(self.fname2foliadoc.items()):
                     output = "./AfterAutoUpdate/" + os.path.basename(fname)
                     dataalign.do_info("Saving to \"{}\"".format(output))
@@ -115,92 +120,89 @@ class Main(object):
         Print panel for a given file name, along with all of its annotations.
         """
         id2sent, manual, auto = self.split_corrections(fname, annots)
-        print('<div class="panel panel-default file-block">')
-        print('<div class="panel-heading filename">{} <a class="show-link">' \
+        out = []  # (written with a single call at the end)
+        out.append('<div class="panel panel-default file-block">\n')
+        out.append('<div class="panel-heading filename">{} <a class="show-link">' \
                 '[<span class="show-or-hide-text">show</span>' \
                 '<span class="show-or-hide-text" style="display:none">hide</span>' \
-                ' {}/{} automatically annotated]</a></div>'.format(
+                ' {}/{} automatically annotated]</a></div>\n'.format(
                     fname, len(auto), len(auto)+len(manual)))
-        print('<div class="panel-body">')
-        print('<div class="list-group">')
+        out.append('<div class="panel-body">\n')
+        out.append('<div class="list-group">\n')
         try:
-            for annot in sorted(manual):
-                self.print_annot(annot, True)
+            for annot in manual:
+                self.print_annot(out, annot, True)
             if self.n_manual == 0:
-                print('<div class="list-group-item annot-entry wtd-list-manual">No re-annotations need to be done manually!</div>')
-            for annot in sorted(auto):
-                self.print_annot(annot, False)
+                out.append('<div class="list-group-item annot-entry wtd-list-manual">No re-annotations need to be done manually!</div>\n')
+            for annot in auto:
+                self.print_annot(out, annot, False)
         except Exception:
+            sys.stdout.write("".join(out))
             import traceback
             traceback.print_exc()
             mwe = " ".join(str(x) for x in annot.json_data.get("source_mwe", annot.indexes))
             print(annot.json_data, file=sys.stderr)
             exit("===============\nERROR when processing JSON file for \"{}\", " \
                     "sentence #{}, MWE \"{}\"".format(fname, annot.sent_id, mwe))
-        print('</div>')  # list-group
-        print('</div>')  # panel-body
-        print('</div>')  # file-block
+        out.append('</div>\n')  # list-group
+        out.append('</div>\n')  # panel-body
+        out.append('</div>\n')  # file-block
+        sys.stdout.write("".join(out))
         return id2sent
 
 
-    def print_annot(self, annot_entry: AnnotEntry, is_manual: bool):
-        r"""Print the annotation item corresponding to one MWE occurrence."""
+    def print_annot(self, out: list, annot_entry: AnnotEntry, is_manual: bool):
+        r"""Append to `out` the annotation item corresponding to one MWE occurrence."""
         if annot_entry.json_data['type'] == 'DO-NOTHING':
             return  # completely hide it, nobody cares when it's DO-NOTHING
 
         right_span = ""
         if hasattr(annot_entry, "message"):
-            right_span = '<span class="{}">{}</span>'.format(
-                ("warn-txt" if is_manual else "auto-txt"), annot_entry.message)
+            right_span = f'<span class="{"warn-txt" if is_manual else "auto-txt"}">{annot_entry.message}</span>'
 
+        kind = "manual" if is_manual else "auto"
+        out.append(f'<div class="list-group-item annot-entry wtd-list-{kind}">{right_span}'
+                   f'{"".join(self.annot2str(annot_entry, "what-to-do-" + kind))}</div>\n')
         if is_manual:
-            print('<div class="list-group-item annot-entry wtd-list-manual">{}{}</div>'.format(
-                    right_span, "".join(self.annot2str(annot_entry, "what-to-do-manual"))))
             self.n_manual += 1
         else:
-            print('<div class="list-group-item annot-entry wtd-list-auto">{}{}</div>'.format(
-                    right_span, "".join(self.annot2str(annot_entry, "what-to-do-auto"))))
             self.n_auto += 1
 
 
     def annot2str(self, annot_entry: AnnotEntry, wtd_class: str) -> str:
         r"""Return the annotation entry corresponding to one MWE occurrence."""
         J = annot_entry.json_data
-        yield '<span class="label label-default sent-id">Sentence #{}</span>'.format(annot_entry.index_infos[0].sent_id)
-        yield '<span class="focus-mwe">{}</span>'.format(" ".join(J.get("source_mwe") or ['+']))
-        if annot_entry.json_data["type"] == "SPECIAL-CASE":
-            yield '<div class="{} wtd-special">{}</div>'.format(wtd_class, J["human_note"])
-
-        elif annot_entry.json_data["type"] == "DELETE-ANNOT":
-            yield '<div class="{} wtd-reannot">Delete annotation: &quot;{}&quot;</div>' \
-                    .format(wtd_class, " ".join(J["source_mwe"]))
-
-        elif annot_entry.json_data["type"] == "NEW-ANNOT":
-            yield '<div class="{} wtd-reannot">Annotate: &quot;{}&quot;</div>' \
-                    .format(wtd_class, " ".join(J["target_mwe"]))
-            yield '<div class="{} wtd-reannot">With category: {}</div>' \
-                    .format(wtd_class, J["target_categ"])
-
-        elif annot_entry.json_data["type"] == "RE-ANNOT":
+        jtype = J["type"]
+        yield f'<span class="label label-default sent-id">Sentence #{annot_entry.index_infos[0].sent_id}</span>'
+        yield f'<span class="focus-mwe">{" ".join(J.get("source_mwe") or ["+"])}</span>'
+        if jtype == "SPECIAL-CASE":
+            yield f'<div class="{wtd_class} wtd-special">{J["human_note"]}</div>'
+
+        elif jtype == "DELETE-ANNOT":
+            yield f'<div class="{wtd_class} wtd-reannot">Delete annotation: &quot;{" ".join(J["source_mwe"])}&quot;</div>'
+
+        elif jtype == "NEW-ANNOT":
+            yield f'<div class="{wtd_class} wtd-reannot">Annotate: &quot;{" ".join(J["target_mwe"])}&quot;</div>'
+            yield f'<div class="{wtd_class} wtd-reannot">With category: {J["target_categ"]}</div>'
+
+        elif jtype == "RE-ANNOT":
             if "target_mwe" not in J or J["source_mwe"] == J["target_mwe"]:
-                yield '<div class="{} wtd-reannot">In token annotation: &quot;{}&quot;</div>' \
-                        .format(wtd_class, " ".join(J["source_mwe"]))
+                yield f'<div class="{wtd_class} wtd-reannot">In token annotation: &quot;{" ".join(J["source_mwe"])}&quot;</div>'
             else:
-                yield '<div class="{} wtd-reannot">Re-annotate tokens: &quot;{}&quot; &rarr; &quot;{}&quot;</div>' \
-                        .format(wtd_class, " ".join(J["source_mwe"]), " ".join(J["target_mwe"]))
+                yield f'<div class="{wtd_class} wtd-reannot">Re-annotate tokens: ' \
+                      f'&quot;{" ".join(J["source_mwe"])}&quot; &rarr; &quot;{" ".join(J["target_mwe"])}&quot;</div>'
 
             if J["source_categ"] == J["target_categ"]:
-                yield '<div class="{} wtd-reannot">Keep category: {}</div>' \
-                        .format(wtd_class, J["source_categ"])
+                yield f'<div class="{wtd_class} wtd-reannot">Keep category: {J["source_categ"]}</div>'
             else:
-                yield '<div class="{} wtd-reannot">Re-annotate category: {} &rarr; {}</div>' \
-                        .format(wtd_class, J["source_categ"], J["target_categ"])
+                yield f'<div class="{wtd_class} wtd-reannot">Re-annotate category: ' \
+                      f'{J["source_categ"]} &rarr; {J["target_categ"]}</div>'
 
         else:
-            raise Exception("Unknown ANNOT type: " + annot_entry.json_data['type'])
+            raise Exception("Unknown ANNOT type: " + jtype)
 
     def load_fname2annots(self):
-        J = json.load(self.args.json_input)
+        J = json_loads(self.args.json_input.buffer.read())
         if not 'META' in J:
             raise Exception('JSON file is too old -- is it from parseme ST 1.0?')
         json_v = J['META']['parseme_json_version']
@@ -212,7 +214,7 @@ class Main(object):
         for coded_key, json_data in J['DECISIONS'].items():
             if coded_key.startswith("MWE_KEY="):
                 # Decode the key (it's a JSON inside a JSON string)
-                key = json.loads(re.sub("^MWE_KEY=", "", coded_key))
+                key = json_loads(coded_key[len("MWE_KEY="):])
                 line_num = next(k[1] for k in key if k)
                 index_infos = tuple(IndexInfo(self.json_id2fname[str(k[0])], k[1], tuple(k[2]))
                                     if k else IndexInfo(self.json_id2fname[str(i)], line_num, ())
@@ -223,11 +225,15 @@ class Main(object):
             else:
                 raise Exception("Unknown coded-key: " + coded_key)
 
+        # Sort once here (`split_corrections` keeps this order in the manual/auto lists)
+        for annots in self.fname2annots.values():
+            annots.sort(key=lambda annot: annot.index_infos)
+
 
     def split_corrections(self, fname, annots):
         r"""Split `annots` in two lists: (manual_annots, auto_annots)"""
         try:
-            id2sent = dict(enumerate([sentence for sentence in self.fname2foliadoc[fname]], 1))
+            id2sent = self.corpus_id2sent(fname)
         except KeyError:
             dataalign.do_warn('File \"{f}\" expected as an argument!', f=fname)
             try:
@@ -236,14 +242,15 @@ class Main(object):
                     dataalign.do_warn('Refusing to use \"{f}\" (it looks like the wrong filename)', f=new_fname, header=True)
                     raise KeyError
                 else:
-                    id2sent = dict(enumerate([sentence for sentence in self.fname2foliadoc[new_fname]], 1))
+                    id2sent = self.corpus_id2sent(new_fname)
                     dataalign.do_warn('Using \"{f}\" instead (you must CHECK if this is correct!)', f=new_fname, header=True)
             except KeyError:
                 id2sent = None  # We cannot shortcut here, because we still need to filter `only_special`
 
         manual, auto = [], []
-        for annot in sorted(annots):
-            if self.args.only_special and annot.json_data["type"] != "SPECIAL-CASE":
+        only_special = self.args.only_special
+        for annot in annots:
+            if only_special and annot.json_data["type"] != "SPECIAL-CASE":
                 auto.append(annot)
                 continue
 
@@ -265,6 +272,15 @@ class Main(object):
         return id2sent, manual, auto
 
 
+    def corpus_id2sent(self, fname):
+        r"""Return {sent_id: Sentence} for corpus file `fname` (raise KeyError if not in input).
+        Each file is only read once, so that all corrections are applied to the same sentences.
+        """
+        if fname not in self.corpus_fname2id2sent:
+            self.corpus_fname2id2sent[fname] = dict(enumerate(self.fname2foliadoc[fname], 1))
+        return self.corpus_fname2id2sent[fname]
+
+
     def corpus_modify(self, sent: dataalign.Sentence,
                      annot: AnnotEntry, recently_auto_annotated: list):
         r"""Modify the corpus data (raise NoteError on failure)."""
@@ -273,38 +289,40 @@ class Main(object):
         if sent is None:
             raise annot.err("File does not have sentence #{}!", annot.index_infos[0].sent_id)
 
-        if annot.json_data["type"] == "DO-NOTHING":
+        J = annot.json_data
+        jtype = J["type"]
+        if jtype == "DO-NOTHING":
             return annot.good("Nothing do to")  # literally do nothing
 
-        elif annot.json_data["type"] in "SPECIAL-CASE":
+        elif jtype in "SPECIAL-CASE":
             raise annot.err("Marked as SPECIAL CASE (cannot be automatically corrected)")
 
-        elif annot.json_data["type"] == "NEW-ANNOT":
+        elif jtype == "NEW-ANNOT":
             indexes = {i for iinfos in annot.index_infos for i in iinfos.indexes}
-            new_mwe = dataalign.MWEOccur(sent, indexes, annot.json_data['target_categ'], None)            
+            new_mwe = dataalign.MWEOccur(sent, indexes, J['target_categ'], None)            
             sent.mweoccurs.append(new_mwe)
             #pdb.set_trace()
             #entity = sent.add(folia.Entity, *[sent[i] for i in indexes])            
             self.corpus_reannot_tokens(new_mwe, annot)
             return annot.good("Automatically annotated")
 
-        elif annot.json_data["type"] in ["RE-ANNOT", "DELETE-ANNOT"]:
+        elif jtype in ["RE-ANNOT", "DELETE-ANNOT"]:
             entity = self.corpus_get_entity(sent, annot)
             if entity is None:
                 raise annot.err("MWE not found in input corpus")
 
-            if annot.json_data["type"] == "DELETE-ANNOT":
+            if jtype == "DELETE-ANNOT":
                 sent.mweoccurs.remove(entity) 
                 return annot.good("Automatically deleted")
 
             RE_SOURCEINFO = re.compile(r"^(?P<categ>\S+)( (?P<confid>[0-9]+)%)?$")
-            sourceinfo = RE_SOURCEINFO.match(annot.json_data["source_categ"]).groupdict()
+            sourceinfo = RE_SOURCEINFO.match(J["source_categ"]).groupdict()
             expected_categ, categ = sourceinfo["categ"], entity.category
             expected_confid, confid = int(sourceinfo["confid"] or 100), int((entity.metadata.confidence or 1)*100)
             if expected_categ != categ:                
                 # reannotation tries to annotate towards correct categ, 
                 # already present in the corpus. Just ignore
-                if annot.json_data['target_categ'] == categ : 
+                if J['target_categ'] == categ : 
                     return annot.good("Target category already correct in the corpus")
                 elif expected_categ == "Skipped":
                     for previous_annot in reversed(recently_auto_annotated):
@@ -315,23 +333,25 @@ class Main(object):
                 raise annot.err("Corpus has unexpected category {} (not {})", categ, expected_categ)
             if expected_confid != confid:
                 raise annot.err("Corpus has unexpected confidence {}% (not {}%)", confid, expected_confid)
-            if annot.json_data["target_categ"] not in dataalign.Categories.KNOWN:                                    
+            if J["target_categ"] not in dataalign.Categories.KNOWN:                                    
                 raise annot.err("Target MWE category is unknown (might be a typo)")            
-            folia_mwe = [sent.tokens[w]['FORM'] for w in list(entity.indexes)]
-            if folia_mwe != annot.json_data["source_mwe"]:
-                raise annot.err("MWE mismatch: JSON {J[source_mwe]} vs Corpus {}", folia_mwe)
+            source_mwe, tokens = J["source_mwe"], sent.tokens
+            if len(entity.indexes) != len(source_mwe) \
+                    or any(tokens[i]['FORM'] != surface for i, surface in zip(entity.indexes, source_mwe)):
+                corpus_mwe = [tokens[i]['FORM'] for i in entity.indexes]
+                raise annot.err("MWE mismatch: JSON {J[source_mwe]} vs Corpus {}", corpus_mwe)
             #pdb.set_trace()
             entity = self.corpus_reannot_tokens(entity, annot)
             # WARNING: First call corpus_reannot_tokens, which may fail before changing `entity`
             # .......: Then, you can change it further (must not `raise` from here on)
-            if annot.json_data["source_categ"] != annot.json_data["target_categ"]:
-                entity.category = annot.json_data["target_categ"]                
+            if J["source_categ"] != J["target_categ"]:
+                entity.category = J["target_categ"]                
                 entity.metadata = dataalign.MWEAnnotMetadata(annotatortype="auto", datetime=ISOTIME,
                 nested=[dataalign.CommentMetadata("[AUTO RE-ANNOT CATEGORY: {} → {}]".format(
-                        annot.json_data["source_categ"], annot.json_data["target_categ"]))])
+                        J["source_categ"], J["target_categ"]))])
             return annot.good("Automatically reannotated")
         else:
-            raise Exception("Unknown ANNOT type: " + annot.json_data['type'])
+            raise Exception("Unknown ANNOT type: " + jtype)
 
 
     def corpus_get_entity(self, sent, annot):
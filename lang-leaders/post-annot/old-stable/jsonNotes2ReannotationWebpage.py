@@ -204,7 +204,7 @@ class Main(object):
         for coded_key, json_data in J['DECISIONS'].items():
             if coded_key.startswith("MWE_KEY="):
                 # Decode the key (it's a JSON inside a JSON string)
-                key = json.loads(re.sub("^MWE_KEY=", "", coded_key))
+                key = json.loads(coded_key[len("MWE_KEY="):])
                 line_num = next(k[1] for k in key if k)
                 index_infos = tuple(IndexInfo(self.json_id2fname[str(k[0])], k[1], tuple(k[2]))
                                     if k else IndexInfo(self.json_id2fname[str(i)], line_num, ())
@@ -297,8 +297,10 @@ class Main(object):
             if annot.json_data["target_categ"] not in dataalign.Categories.KNOWN:
                 raise annot.err("Target MWE category is unknown (might be a typo)")
 
-            folia_mwe = [w.text() for w in entity.wrefs()]
-            if folia_mwe != annot.json_data["source_mwe"]:
+            source_mwe, wrefs = annot.json_data["source_mwe"], entity.wrefs()
+            if len(wrefs) != len(source_mwe) \
+                    or any(w.text() != surface for w, surface in zip(wrefs, source_mwe)):
+                folia_mwe = [w.text() for w in wrefs]
                 raise annot.err("MWE mismatch: JSON {J[source_mwe]} vs XML {}", folia_mwe)
 
             self.folia_reannot_tokens(entity, annot)
@@ -0,0 +1,98 @@
+#! /usr/bin/env python3
+
+r"""
+This module provides a compiled replacement for `difflib.SequenceMatcher`,
+used by `dataalign.py` when aligning sentences/tokens.
+
+This module requires Numba (and NumPy) to be installed.
+If they are missing, importing it raises ImportError and
+`dataalign.py` falls back to `difflib` instead.
+
+Avoid using this module directly (use `dataalign.matching_blocks` instead).
+"""
+
+import itertools
+
+import numpy as np
+from numba import njit
+
+
+# Sequences at least this long are subject to difflib's "autojunk" heuristic,
+# which we do not reproduce (callers should use difflib for these)
+AUTOJUNK_MIN_LEN = 200
+
+
+def matching_blocks(seq_a, seq_b):
+    r"""Return a list of (i, j, size) triples, with the same output as
+    `difflib.SequenceMatcher(None, seq_a, seq_b).get_matching_blocks()`.
+    Elements of both sequences must be hashable.
+    """
+    elem2id = {}
+    ab = np.array([elem2id.setdefault(x, len(elem2id)) for x in itertools.chain(seq_a, seq_b)], dtype=np.int32)
+    a, b = ab[:len(seq_a)], ab[len(seq_a):]
+    blocks = _matching_blocks(a, b)
+    return list(map(tuple, blocks.tolist())) + [(len(a), len(b), 0)]
+
+
+@njit(cache=True)
+def _longest_match(a, b, alo, ahi, blo, bhi, prev, curr):
+    r"""Return (i, j, k) for the longest block a[i:i+k] == b[j:j+k] inside the given ranges.
+    Ties are broken like difflib: smallest `i` first, then smallest `j`.
+    """
+    besti, bestj, bestsize = alo, blo, 0
+    prev[blo:bhi+1] = 0
+    curr[blo] = 0
+    for i in range(alo, ahi):
+        for j in range(blo, bhi):
+            if a[i] == b[j]:
+                k = prev[j] + 1
+                curr[j+1] = k
+                if k > bestsize:
+                    besti, bestj, bestsize = i-k+1, j-k+1, k
+            else:
+                curr[j+1] = 0
+        prev, curr = curr, prev
+    return besti, bestj, bestsize
+
+
+@njit(cache=True)
+def _matching_blocks(a, b):
+    r"""Return an int array of shape (N, 3) with the non-adjacent matching blocks (without sentinel)."""
+    la, lb = len(a), len(b)
+    prev = np.zeros(lb+1, dtype=np.int32)
+    curr = np.zeros(lb+1, dtype=np.int32)
+    found = np.zeros((min(la, lb)+1, 3), dtype=np.int64)
+    n_found = 0
+
+    queue = [(0, la, 0, lb)]
+    while queue:
+        alo, ahi, blo, bhi = queue.pop()
+        i, j, k = _longest_match(a, b, alo, ahi, blo, bhi, prev, curr)
+        if k:
+            found[n_found, 0], found[n_found, 1], found[n_found, 2] = i, j, k
+            n_found += 1
+            if alo < i and blo < j:
+                queue.append((alo, i, blo, j))
+            if i+k < ahi and j+k < bhi:
+                queue.append((i+k, ahi, j+k, bhi))
+
+    found = found[:n_found]
+    found = found[np.argsort(found[:, 0])]
+
+    # Collapse adjacent blocks (same as difflib)
+    ret = np.zeros((n_found, 3), dtype=np.int64)
+    n_ret = 0
+    i1, j1, k1 = 0, 0, 0
+    for n in range(n_found):
+        i2, j2, k2 = found[n, 0], found[n, 1], found[n, 2]
+        if i1 + k1 == i2 and j1 + k1 == j2:
+            k1 += k2
+        else:
+            if k1:
+                ret[n_ret, 0], ret[n_ret, 1], ret[n_ret, 2] = i1, j1, k1
+                n_ret += 1
+            i1, j1, k1 = i2, j2, k2
+    if k1:
+        ret[n_ret, 0], ret[n_ret, 1], ret[n_ret, 2] = i1, j1, k1
+        n_ret += 1
+    return ret[:n_ret]
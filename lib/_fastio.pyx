@@ -0,0 +1,102 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+
+r"""
+This module provides compiled versions of the hot loops
+in `dataalign.AbstractFileIterator` and `dataalign.Token.from_str_*`
+(one iteration per input line).
+
+This module must be compiled ahead of time with `lib/build_fastio.py` (requires Cython).
+If it is not built, `dataalign.py` uses the pure-Python methods instead.
+Any change to these methods must be mirrored here (`TestFastio` in `test/test_dataalign.py`
+compares both versions; it runs in the `test_dataalign_fastio` CI job).
+
+Avoid using this module directly (iterate over `dataalign.AbstractFileIterator` instead).
+"""
+
+from sys import intern
+
+
+def iter_sentences(it):
+    r"""Same as `AbstractFileIterator._iter_sentences` (yield Sentence's for the lines of `it`)."""
+    cdef str line
+    cdef Py_ssize_t lineno = 0
+
+    with it.fileobj:
+        yield from it.iter_header(it.fileobj)
+        for line in it.iter_lines():
+            lineno += 1
+            it.lineno = lineno
+            try:
+                line = line.strip("\n")
+                if line.startswith("#"):
+                    it.make_comment(line)
+                elif not line or line.isspace():
+                    if not it.curr_sent.empty():
+                        yield it.finish_sentence()
+                else:
+                    append_token(it, line)
+            except:
+                it.warn("Unable to read & parse line", warntype="FATAL")
+                raise
+        if not it.curr_sent.empty():
+            yield it.finish_sentence()
+        yield from it.iter_footer(it.fileobj)
+
+
+cpdef append_token(it, str line):
+    r"""Same as `AbstractFileIterator.append_token`."""
+    cdef list tokens
+    cdef str mwecode, mwe_id, categ, rank
+    cdef dict data
+
+    token, mwecodes = it.get_token_and_mwecodes(line.split("\t", it.MAXSPLIT))  # method defined in subclass
+    curr_sent = it.curr_sent
+    tokens = curr_sent.tokens
+    data = token._data
+    rank = data['ID']
+
+    if mwecodes:
+        index = len(tokens)
+        id2mwe_ranks, id2mwe_indexes = it.id2mwe_ranks, it.id2mwe_indexes
+        for mwecode in mwecodes:
+            mwe_id, _, categ = mwecode.partition(":")
+            id2mwe_ranks[mwe_id].append(rank)
+            id2mwe_indexes[mwe_id].append(index)
+            if categ and ":" not in categ:  # (codes such as "1:VID:x" have no category)
+                categ = curr_sent.check_and_convert_categ(categ)
+                it.id2mwe_categ.setdefault(mwe_id, categ)
+
+    # Same as `curr_sent.append_token(token)`, without going through the Token properties
+    tokens.append(token)
+    curr_sent.ranks.append(rank)
+    curr_sent.surfaces.append(data['FORM'])
+    curr_sent.nsps.append('SpaceAfter=No' in data.get('MISC', ''))
+
+
+cpdef dict token_data(pairs):
+    r"""Same as the dict built in `Token.from_str_pairs`."""
+    cdef dict ret = {}
+    cdef str k, v
+    for k, v in pairs:
+        if v and (v != '_' or k == 'FORM'):
+            ret[k] = v
+    if 'FORM' not in ret:
+        ret['FORM'] = '_'
+    return ret
+
+
+cpdef dict token_data_from_columns(list colnames, list values, list interned_indexes):
+    r"""Same as the dict built in `Token.from_str_columns` (interns `values` in place)."""
+    cdef dict ret = {}
+    cdef str k, v
+    cdef Py_ssize_t i, n = min(len(colnames), len(values))
+    for i in interned_indexes:
+        if i < n:
+            values[i] = intern(values[i])
+    for i in range(n):
+        k, v = colnames[i], values[i]
+        if v and (v != '_' or k == 'FORM'):
+            ret[k] = v
+    if 'FORM' not in ret:
+        ret['FORM'] = '_'
+    return ret
@@ -0,0 +1,27 @@
+#! /usr/bin/env python3
+
+r"""
+Build the optional `_fastio` extension module next to `dataalign.py`.
+This requires Cython and a C compiler; run it once after each change to `_fastio.pyx`:
+
+    python3 lib/build_fastio.py
+
+If `_fastio` is not built, `dataalign.py` uses its pure-Python methods instead.
+"""
+
+import os
+import tempfile
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+
+LIB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+if __name__ == "__main__":
+    os.chdir(LIB_DIR)
+    with tempfile.TemporaryDirectory() as build_temp:
+        setup(name="_fastio",
+              script_args=["build_ext", "--inplace", "--build-temp", build_temp, "--build-lib", build_temp],
+              ext_modules=cythonize("_fastio.pyx", language_level=3, build_dir=build_temp))
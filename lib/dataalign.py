@@ -18,17 +18,28 @@ a canonical form (used e.g. when grouping MWEs during consistency check):
 
   * To change word order, add special code to `_with_reordered_tokens`.
     (e.g. to reorder the LVC "(a) bath (was) taken" as "take bath").
+
+The environment variables PARSEME_WORKERS, PARSEME_DEBUG, COLOR_STDOUT
+and COLOR_STDERR are documented in `lib/README.md`.
 """
 
 
 import abc
+import array
 import collections
+import concurrent.futures
+import contextlib
 import difflib
+import functools
+import io
 import itertools
 import json
+import mmap
+import operator
 import os
 import re
 import sys
+import unicodedata
 
 
 # Import the Categories class
@@ -38,34 +49,47 @@ from categories import Categories
 try:
     from folia import main as folia # Python3.5 and later only
     #from pynlpl.formats import folia
+    from lxml import etree  # (installed along with FoliaPY)
 except ImportError:
     exit("ERROR: FoliaPY not found, please run this code: pip3 install folia")
 
+try:
+    import _fastio  # Optional: compiled file-reading loops (built with `lib/build_fastio.py`)
+except ImportError:
+    _fastio = None
+
 # The `empty` field in CoNLL-U and PARSEME-TSV
 EMPTY = "_"
 
 # Languages where the canonical form should have the lemmas for all tokens
 # Reason: HI = has many MVCs; HU = has bad POS tags
 # (XXX this is a workaround, we should rethink this for ST 2.0)
-LANGS_WITH_ALL_CANONICAL_TOKENS_LEMATIZED = set("HI HU".split())
+LANGS_WITH_ALL_CANONICAL_TOKENS_LEMATIZED = frozenset("HI HU".split())
 
 
 ############################################################
 
 # Set of all valid languages in PARSEME corpora
-LANGS = set("AR BG CS DE EL EN ES EU FA FR GA HE HR HU HI IT LT MT PL PT RO SL SR SV TR ZH".split())
+LANGS = frozenset("AR BG CS DE EL EN ES EU FA FR GA HE HR HU HI IT LT MT PL PT RO SL SR SV TR ZH".split())
 
 # Languages where the pronoun in IRV is canonically on the left
-LANGS_WITH_CANONICAL_REFL_PRON_ON_LEFT = set("DE EU FR RO".split())
+LANGS_WITH_CANONICAL_REFL_PRON_ON_LEFT = frozenset("DE EU FR RO".split())
 
 # Languages where the verb canonically appears to the right of the object complement (SOV/OSV/OVS)
-LANGS_WITH_CANONICAL_VERB_ON_RIGHT = set("DE EU HI TR".split())
+LANGS_WITH_CANONICAL_VERB_ON_RIGHT = frozenset("DE EU HI TR".split())
 
 # Languages where the verb occurrences usually appear to the right of the object complement (SOV/OSV/OVS)
-LANGS_WITH_VERB_OCCURRENCES_ON_RIGHT = LANGS_WITH_CANONICAL_VERB_ON_RIGHT - set(["DE"])
+LANGS_WITH_VERB_OCCURRENCES_ON_RIGHT = LANGS_WITH_CANONICAL_VERB_ON_RIGHT - {"DE"}
 
 # Languages that are written right-to-left (FLAT needs to know this for proper displaying)
-LANGS_WRITTEN_RTL = set("AR FA HE YI".split())
+LANGS_WRITTEN_RTL = frozenset("AR FA HE YI".split())
+
+# Lemma of the reflexive pronoun in the canonical form of IRVs, e.g. FR "me" or "te" => "se"
+REFL_PRON_CANONICAL_LEMMA = {"PT": "se", "ES": "se", "FR": "se", "IT": "si", "EN": "oneself"}
+
+# Integer IDs for the universal POS tags that we inspect inside MWEs (all other tags are POS_OTHER)
+POS_OTHER, POS_VERB, POS_NOUN, POS_PRON, POS_PART, POS_CONJ = range(6)
+UNIV_POS_IDS = {"VERB": POS_VERB, "NOUN": POS_NOUN, "PRON": POS_PRON, "PART": POS_PART, "CONJ": POS_CONJ}
 
 
 ############################################################
@@ -77,6 +101,24 @@ def interpret_color_request(stream, color_req: str) -> bool:
 COLOR_STDOUT = interpret_color_request(sys.stdout, os.getenv('COLOR_STDOUT', 'auto'))
 COLOR_STDERR = interpret_color_request(sys.stderr, os.getenv('COLOR_STDERR', 'auto'))
 
+# Flag indicating whether we want to run (expensive) internal sanity checks, via PARSEME_DEBUG=1
+DEBUG_CHECKS = os.getenv('PARSEME_DEBUG', '') not in ('', '0')
+
+def interpret_workers_request(workers_req: str) -> int:
+    r"""Interpret environment variable PARSEME_WORKERS (number of processes; "0" for the number of CPUs)."""
+    try:
+        n_workers = int(workers_req)
+        if n_workers < 0:
+            raise ValueError(workers_req)
+    except ValueError:
+        do_warn('Ignoring PARSEME_WORKERS={req!r} (expected a number of processes, '
+                'or 0 for the number of CPUs); using 1 worker', req=workers_req)
+        return 1
+    return n_workers or os.cpu_count() or 1
+
+# The max number of worker processes used to parse input files in parallel is `N_WORKERS`, via PARSEME_WORKERS=N
+# (default: 1, parse all files in the main process); it is set below `do_warn`, to report invalid values
+
 
 ############################################################
 
@@ -124,6 +166,18 @@ class KVPair:
         return obj
 
 
+# FoLiA lookups done once per MWE annotation (bound here, to keep them out of the per-MWE code)
+_FOLIA_GENERIC_ATTRS = operator.attrgetter('annotator', 'annotatortype', 'datetime', 'confidence')
+_FOLIA_COMMENT = folia.Comment
+_FOLIA_COMMENT_OR_DESC = (folia.Comment, folia.Description)
+_FOLIA_TEXT_FROM_CHILDREN = (folia.AbstractStructureElement, folia.Correction, folia.AbstractSpanAnnotation)
+
+# Qualified XML tags, for FoLiA documents that are streamed with lxml (see `FoliaIterator`)
+_XML_ID = '{http://www.w3.org/XML/1998/namespace}id'
+_XML_FOLIA_TAG = {tag: '{%s}%s' % (folia.NSFOLIA, tag) for tag in [
+        'FoLiA', 'metadata', 'meta', 'text', 's', 'w', 't', 'foreign-data', 'comment', 'entities', 'entity', 'wref']}
+
+
 class Metadata(KVPair, abc.ABC):
     r"""Represents common metadata from user annotations
     (This is basically the set of key-value properties
@@ -160,14 +214,34 @@ class Metadata(KVPair, abc.ABC):
     @staticmethod
     def from_folia(f: folia.AbstractElement):
         r"""Return Metadata for given FoLiA element `f`."""
+        annotator, annotatortype, datetime, confidence = _FOLIA_GENERIC_ATTRS(f)
         return Metadata._instantiate_from_folia(
-            f, annotator=f.annotator, annotatortype=f.annotatortype,
-            datetime=(f.datetime.isoformat() if f.datetime else None), confidence=f.confidence,
-            nested=[Metadata.from_folia(c) for c in f.select(folia.Comment)])
+            f, annotator=annotator, annotatortype=annotatortype,
+            datetime=(datetime.isoformat() if datetime else None), confidence=confidence,
+            nested=[Metadata.from_folia(c) for c in f.select(_FOLIA_COMMENT)])
+
+    @staticmethod
+    def from_folia_xml(e: etree._Element):
+        r"""Return Metadata for given FoLiA XML element `e` (same as `from_folia`,
+        for documents without annotation defaults/provenance).
+        """
+        get = e.attrib.get
+        datetime, confidence = get('datetime'), get('confidence')
+        datetime = folia.parse_datetime(datetime) if datetime else None
+        kwargs = dict(annotator=get('annotator'), annotatortype=get('annotatortype'),
+                      datetime=(datetime.isoformat() if datetime else None),
+                      confidence=(float(confidence) if confidence is not None else None),
+                      nested=[Metadata.from_folia_xml(c) for c in e.iterdescendants(_XML_FOLIA_TAG['comment'])])
+        if e.tag == _XML_FOLIA_TAG['comment']:
+            return CommentMetadata(e.text or "", **kwargs)
+        elif e.tag == _XML_FOLIA_TAG['entity']:
+            return MWEAnnotMetadata(**kwargs)
+        else:
+            assert False, e
 
     @staticmethod
     def _instantiate_from_folia(f: folia.AbstractElement, **kwargs):
-        if isinstance(f, (folia.Comment, folia.Description)):
+        if isinstance(f, _FOLIA_COMMENT_OR_DESC):
             # We convert <desc> tags to <comment>, for simplicity
             return CommentMetadata(f.value, **kwargs)
         elif isinstance(f, folia.Entity):
@@ -294,6 +368,8 @@ class Token(collections.abc.Mapping):
     Instances behave like a frozen dict, so you can do
     e.g. token["LEMMA"] to obtain the lemma.
     """
+    __slots__ = ('_data',)
+
     def __init__(self, *args, **kwargs):
         data = dict(*args, **kwargs)
         # (Note we allow FORM=="_", because it can mean underspecified OR "_" itself
@@ -301,9 +377,38 @@ class Token(collections.abc.Mapping):
                       if v and (v != '_' or k == 'FORM')}
         self._data.setdefault('FORM', '_')
 
+    @staticmethod
+    def from_str_pairs(pairs):
+        r'''Return a Token for an iterable of (key, value) pairs where all keys and values are `str`.
+        (Same as `Token(pairs)`, but faster, as it is called for every token in the input files).
+        '''
+        ret = Token.__new__(Token)
+        if _fastio:
+            ret._data = _fastio.token_data(pairs)
+        else:  # (mirrored in `_fastio.pyx`)
+            ret._data = {k: v for (k, v) in pairs if v and (v != '_' or k == 'FORM')}
+            ret._data.setdefault('FORM', '_')
+        return ret
+
+    @staticmethod
+    def from_str_columns(colnames: 'list[str]', values: 'list[str]', interned_indexes: 'list[int]'):
+        r'''Return a Token for parallel lists of keys and values (same as `Token(zip(colnames, values))`),
+        where the values at `interned_indexes` are interned (`values` is modified in place).
+        '''
+        if not _fastio:  # (mirrored in `_fastio.pyx`)
+            n_values = len(values)
+            for i in interned_indexes:
+                if i < n_values:
+                    values[i] = sys.intern(values[i])
+            return Token.from_str_pairs(zip(colnames, values))
+        ret = Token.__new__(Token)
+        ret._data = _fastio.token_data_from_columns(colnames, values, interned_indexes)
+        return ret
+
     def with_update(self, *args, **kwargs):
         r'''Return a copy Token with updated key-value pairs.'''
-        ret = Token(self._data)
+        ret = Token.__new__(Token)  # (`self._data` is already filtered, no need to go through `__init__`)
+        ret._data = self._data.copy()
         ret._data.update(*args, **kwargs)
         return ret
 
@@ -318,7 +423,7 @@ class Token(collections.abc.Mapping):
 
     def lemma_or_surface(self):
         r'''Return the lemma, if known, or the surface form otherwise'''
-        return self.get('LEMMA', self['FORM'])
+        return self._data.get('LEMMA', self._data['FORM'])
 
     def __iter__(self):
         return iter(self._data)
@@ -326,6 +431,10 @@ class Token(collections.abc.Mapping):
         return len(self._data)
     def __getitem__(self, key):
         return self._data[key]
+    def __contains__(self, key):
+        return key in self._data
+    def get(self, key, default=None):
+        return self._data.get(key, default)
     def __hash__(self):
         return hash(frozenset(self.items()))
     def __repr__(self):
@@ -336,24 +445,25 @@ class Token(collections.abc.Mapping):
         return (self.rank, self.surface, self.nsp, self.get('LEMMA', ''),
                 self.univ_pos, self.get('HEAD'), self.get('DEPREL'))
 
+    # (Properties below access `_data` directly, as they are used in the hot loops)
     @property
     def rank(self):
-        return self['ID']
+        return self._data['ID']
     @property
     def surface(self):
-        return self['FORM']
+        return self._data['FORM']
     @property
     def nsp(self):
-        return 'SpaceAfter=No' in self.get('MISC', '')
+        return 'SpaceAfter=No' in self._data.get('MISC', '')
     @property
     def lemma(self):
-        return self['LEMMA']
+        return self._data['LEMMA']
     @property
     def univ_pos(self):
-        return self.get('UPOS')
+        return self._data.get('UPOS')
 
     def has_dependency_info(self):
-        return 'DEPREL' in self and 'HEAD' in self
+        return 'DEPREL' in self._data and 'HEAD' in self._data
 
 
 class CorpusInfo:
@@ -367,14 +477,23 @@ class Sentence:
     r"""A sequence of tokens.
     Each MWE is represented as an MWEOccur (with a MWEAnnotMetadata).
     Other KVPair metadata are stored in kv_pairs.
+
+    The `ranks`, `surfaces` and `nsps` attributes are columns parallel to `tokens`,
+    for code that scans a single field of every token. Do not modify `tokens`
+    directly; use `append_token` or `re_tokenize` to keep these in sync.
     """
     def __init__(self, corpusinfo: CorpusInfo, nth_sent: int, lineno: int):
         self.corpusinfo = corpusinfo
         self.nth_sent = nth_sent
         self.lineno = lineno
         self.tokens = []              # type: list[Token]
+        self.ranks = []               # type: list[str]
+        self.surfaces = []            # type: list[str]
+        self.nsps = array.array('b')  # type: array[bool]
         self.mweoccurs = []           # type: list[MWEOccur]
         self.kv_pairs = []            # type: list[KVPair]
+        self._errprefixes = {}        # type: dict[bool, str]
+        self._rank2index = (None, 0, None)  # (ranks, len(ranks), dict) cached by `rank2index`
 
     @property
     def file_path(self):
@@ -382,37 +501,64 @@ class Sentence:
 
     def __str__(self):
         r"""Return a string representation of the tokens"""
-        return " ".join(map(lambda x: x.surface, self.tokens))
+        return " ".join(self.surfaces)
 
     def empty(self):
         r"""True iff this Sentence is empty."""
         return not (self.tokens or self.mweoccurs)
 
+    def append_token(self, token: Token):
+        r"""Append `token` to `self.tokens` (and to the per-field columns)."""
+        self.tokens.append(token)
+        self.ranks.append(token.rank)
+        self.surfaces.append(token.surface)
+        self.nsps.append(token.nsp)
+
     def rank2index(self):
-        r"""Return a dictionary mapping string ranks to indexes."""
-        return {t.rank: index for (index, t) in enumerate(self.tokens)}
+        r"""Return a dictionary mapping string ranks to indexes (cached: do not modify it)."""
+        cached_ranks, cached_len, ret = self._rank2index
+        if cached_ranks is not self.ranks or cached_len != len(self.ranks):  # (tokens were replaced/appended)
+            ret = dict(zip(self.ranks, range(len(self.ranks))))
+            self._rank2index = (self.ranks, len(self.ranks), ret)
+        return ret
 
-    def tokens_and_mwecodes(self):
-        r"""Yield pairs (token, mwecodes) of type (Token, list[str])."""
-        tokenindex2mweindex = collections.defaultdict(list)
+    def tokenindex2mweindexes(self):
+        r"""Return a list with the indexes (in `self.mweoccurs`) of the MWEs of each token
+        (None for tokens that are not in any MWE).
+        """
+        tokenindex2mweindex = [None] * len(self.tokens)  # type: list[Optional[list[int]]]
         for mweindex, mweoccur in enumerate(self.mweoccurs):
             for index in mweoccur.indexes:
-                tokenindex2mweindex[index].append(mweindex)
-
-        for itoken, token in enumerate(self.tokens):
-            mwe_is = tokenindex2mweindex[itoken]
-            yield token, [self._mwecode(itoken, mwe_i) for mwe_i in mwe_is]
+                if tokenindex2mweindex[index] is None:
+                    tokenindex2mweindex[index] = [mweindex]
+                else:
+                    tokenindex2mweindex[index].append(mweindex)
+        return tokenindex2mweindex
 
-    def _mwecode(self, itoken, mwe_i):
-        r"""Return a string with mweid:category (or just mweid in some cases)."""
-        mweoccur = self.mweoccurs[mwe_i]
-        if mweoccur.category and mweoccur.indexes[0] == itoken:
-            return "{}:{}".format(mwe_i+1, mweoccur.category)
-        return str(mwe_i+1)
+    def tokens_and_mwecodes(self):
+        r"""Yield pairs (token, mwecodes) of type (Token, list[str])."""
+        if not self.mweoccurs:  # Common case: sentence without MWEs
+            for token in self.tokens:
+                yield token, []
+            return
+        tokenindex2mweindex = self.tokenindex2mweindexes()
+        mwe_first_index = [(m.indexes[0] if m.indexes else None) for m in self.mweoccurs]
+        # MWE codes are "mweid:category" on the first token of each MWE, and just "mweid" elsewhere
+        other_codes = [str(mwe_i+1) for mwe_i in range(len(self.mweoccurs))]
+        first_codes = [("{}:{}".format(code, m.category) if m.category else code)
+                       for (code, m) in zip(other_codes, self.mweoccurs)]
+        for itoken, (token, mwe_is) in enumerate(zip(self.tokens, tokenindex2mweindex)):
+            if mwe_is is None:
+                yield token, []
+            else:
+                yield token, [(first_codes[mwe_i] if mwe_first_index[mwe_i] == itoken else other_codes[mwe_i])
+                              for mwe_i in mwe_is]
 
     def remove_non_vmwes(self):
         r"""Change the mwe_codes in `self.tokens` so as to remove all NonVMWE tags."""
-        self.mweoccurs = [m for m in self.mweoccurs if m.category not in Categories.NON_MWES]
+        non_mwes = Categories.NON_MWES
+        if any(m.category in non_mwes for m in self.mweoccurs):  # (most sentences have nothing to remove)
+            self.mweoccurs = [m for m in self.mweoccurs if m.category not in non_mwes]
 
     def remove_duplicate_mwes(self):
         r"""Uniqs self.mweoccurs (keeps only first occurrence)"""
@@ -424,18 +570,30 @@ class Sentence:
                 self.warn("Removed duplicate MWE: {}".format(mweoccurs))
 
 
-    def re_tokenize(self, new_tokens: 'list[Token]', indexmap: 'dict[int,list[int]]'):
-        r"""Replace `self.tokens` with given tokens and fix `self.mweoccurs` based on `indexmap`"""
-        self_nsps = set(i for (i, t) in enumerate(self.tokens) if t.nsp)
-        self.tokens = [t.with_nospace(i in self_nsps) for (i, t) in enumerate(new_tokens)]
-        self.mweoccurs = [m.remapped_indexes(indexmap) for m in self.mweoccurs]
+    def re_tokenize(self, new_sentence: 'Sentence', indexmap: 'dict[int,list[int]]'):
+        r"""Replace `self.tokens` with the tokens of `new_sentence` and fix `self.mweoccurs` based on `indexmap`.
+        The per-field columns of `new_sentence` are taken over (do not use `new_sentence` afterwards).
+        """
+        n_old = len(self.tokens)
+        old2new = [indexmap.get(i_old, (i_old,)) for i_old in range(n_old)]  # shared by all MWEOccurs
+        tokens, nsps = new_sentence.tokens, new_sentence.nsps
+        for i in itertools.compress(range(min(n_old, len(tokens))), self.nsps):
+            if not nsps[i]:  # (keep the SpaceAfter=No from the old tokenization)
+                tokens[i] = tokens[i].with_nospace(True)
+                nsps[i] = True
+        self.tokens, self.ranks, self.surfaces, self.nsps = tokens, new_sentence.ranks, new_sentence.surfaces, nsps
+        self.mweoccurs = [m.remapped_indexes(old2new) for m in self.mweoccurs]
 
 
     def errprefix(self, *, short=True):
         r"""Return a sentence ID, such as "foo.xml(s.13):78"."""
-        ret = self.corpusinfo.file_path if not short else os.path.basename(self.corpusinfo.file_path)
-        ret += "(s.{})".format(self.nth_sent) if self.nth_sent else ""
-        return ret + (":{}".format(self.lineno) if self.lineno else "")
+        ret = self._errprefixes.get(short)
+        if ret is None:  # not cached yet
+            ret = self.corpusinfo.file_path if not short else os.path.basename(self.corpusinfo.file_path)
+            ret += "(s.{})".format(self.nth_sent) if self.nth_sent else ""
+            ret += (":{}".format(self.lineno) if self.lineno else "")
+            self._errprefixes[short] = ret
+        return ret
 
     def warn(self, msg_fmt, **kwargs):
         r"""Print a warning message; e.g. "foo.xml:13: blablabla"."""
@@ -527,7 +685,7 @@ class Sentence:
 
     def calc_artificial_text(self) -> KVPair:
         r"""Calculate required `text` attribute for CoNLL-UP."""
-        return KVPair('text', ''.join(token.surface + ('' if token.nsp else ' ') for token in self.tokens))
+        return KVPair('text', ''.join(surface + ('' if nsp else ' ') for (surface, nsp) in zip(self.surfaces, self.nsps)))
 
     def calc_artificial_sent_id(self, sent_id_key="source_sent_id") -> KVPair:
         r"""Calculate required `source_sent_id` attribute for CoNLL-UP."""
@@ -572,14 +730,15 @@ class MWEOccur:
         self.category = category
         self.metadata = metadata
 
-        self.raw = MWEOccurView(self, (sentence.tokens[i] for i in indexes))
+        self.raw = MWEOccurView(self, tuple(map(sentence.tokens.__getitem__, indexes)))
         self.fixed = self.raw._with_fixed_tokens()
         self.reordered = self.fixed._with_reordered_tokens()
 
-        assert all(t.rank == tf.rank for (t, tf) in zip(self.raw.tokens,
-                self.fixed.tokens)), "BUG: _with_fixed_tokens must preserve order"
-        assert set(self.reordered.tokens) == set(self.fixed.tokens), \
-                "BUG: _with_reordered_tokens must not change word attributes"
+        if DEBUG_CHECKS:
+            assert all(t.rank == tf.rank for (t, tf) in zip(self.raw.tokens,
+                    self.fixed.tokens)), "BUG: _with_fixed_tokens must preserve order"
+            assert set(self.reordered.tokens) == set(self.fixed.tokens), \
+                    "BUG: _with_reordered_tokens must not change word attributes"
 
     def mweo_id(self):
         r"""Return an ID that uniquely identifies the file&sentence&indexes."""
@@ -596,19 +755,25 @@ class MWEOccur:
             and self.sentence.nth_sent == other.sentence.nth_sent \
             and (set(self.indexes) & set(other.indexes))
 
-    def remapped_indexes(self, indexmap: 'dict[int,list[int]]'):
-        r"""Remap the indexes in self based on indexmap."""
-        new_indexes = [i_new  for i_old in self.indexes for i_new in indexmap.get(i_old, (i_old,))]  # flatmap
+    def remapped_indexes(self, indexmap: 'dict[int,list[int]] | list[list[int]]'):
+        r"""Remap the indexes in self based on indexmap
+        (either a dict, or a list with one entry per token in `self.sentence`).
+        """
+        if isinstance(indexmap, list):
+            new_indexes = [i_new  for i_old in self.indexes for i_new in indexmap[i_old]]  # flatmap
+        else:
+            new_indexes = [i_new  for i_old in self.indexes for i_new in indexmap.get(i_old, (i_old,))]  # flatmap
         return MWEOccur(self.sentence, new_indexes, self.category, self.metadata)
 
     def with_mwes_from_ranges_absorbed_into_tokens(self):
         r"""Return an MWEOccur where MWEs in ranges are moved into the element tokens."""
-        if not any("-" in self.sentence.tokens[i]['ID'] for i in self.indexes):
+        ranks = self.sentence.ranks
+        if not any("-" in ranks[i] for i in self.indexes):
             return self  # No ranges in this MWEOccur, nothing to do
         r2i = self.sentence.rank2index()
         indexmap = {}
         for i in self.indexes:
-            wid = self.sentence.tokens[i]['ID']
+            wid = ranks[i]
             if "-" in wid:
                 first, last = wid.split('-', 1)
                 indexmap[i] = range(r2i[first], r2i[last]+1)
@@ -647,6 +812,10 @@ class MWEOccurView:
     @param mwe_occur: The MWEOccur that this view represents
     @type  iter_tokens: Iterable[Token]
     @param iter_tokens: Tokens for MWEs in this view (may be different from literal order in Sentence)
+    @type  pos_ids: Optional[list[int]]
+    @param pos_ids: POS IDs of `iter_tokens`, if already known (e.g. when deriving a view from another one)
+    @type  i_heads: Optional[tuple[int, Optional[int]]]
+    @param i_heads: Pair (i_head, i_subhead), if already known (e.g. for a view with the same `pos_ids`)
 
     Attributes:
     @type  tokens: tuple[Token]
@@ -659,46 +828,58 @@ class MWEOccurView:
     @param i_subhead: Index of subhead noun (e.g. for LVCs and some VIDs). May be `None`.
     @type  i_synroots: tuple[int]
     @param i_synroots: Index of syntactic roots (requires syntax info in CoNLL-U). Empty list if unavailable.
+    @type  pos_ids: list[int]
+    @param pos_ids: POS of each token in `tokens`, as one of the POS_* integer IDs.
     '''
-    def __init__(self, mwe_occur, iter_tokens):
+    def __init__(self, mwe_occur, iter_tokens, pos_ids=None, i_heads=None):
         self.mwe_occur = mwe_occur
-        self.tokens = tuple(iter_tokens)
-        assert all(isinstance(t, Token) for t in self.tokens), self.tokens
-        self.i_head = self._i_head()
-        self.i_subhead = self._i_subhead()
+        self.tokens = iter_tokens if type(iter_tokens) is tuple else tuple(iter_tokens)
+        assert not self.tokens or isinstance(self.tokens[0], Token), self.tokens
+        self.pos_ids = pos_ids if pos_ids is not None \
+                else [UNIV_POS_IDS.get(t.univ_pos, POS_OTHER) for t in self.tokens]
+        self.i_head, self.i_subhead = i_heads if i_heads is not None else (self._i_head(), self._i_subhead())
         self.head = self.tokens[self.i_head]
         self.subhead = self.tokens[self.i_subhead] if (self.i_subhead is not None) else None
-        self.likely_lemmatizedform = self._lemmatized_at(range(len(self.tokens)))    
-        self.likely_canonicform = self._likely_canonicform()
+
+    @property
+    def likely_lemmatizedform(self):
+        try:
+            return self._likely_lemmatizedform
+        except AttributeError:  # (calculated lazily, as most views never need it)
+            self._likely_lemmatizedform = self._lemmatized_at(range(len(self.tokens)))
+            return self._likely_lemmatizedform
+
+    @property
+    def likely_canonicform(self):
+        try:
+            return self._likely_canonicform
+        except AttributeError:  # (calculated lazily, as most views never need it)
+            self._likely_canonicform = self._calc_likely_canonicform()
+            return self._likely_canonicform
 
     def _i_head(self):
         r"""Index of head verb in `likely_canonicform`
         (First word if there is no POS info available)."""
-        i_verbs = [i for (i, t) in enumerate(self.tokens) if t.univ_pos == "VERB"] \
-                or [(-1 if self.mwe_occur.lang in LANGS_WITH_VERB_OCCURRENCES_ON_RIGHT else 0)]
-        return i_verbs[0]  # just take first verb that appears
+        if POS_VERB in self.pos_ids:
+            return self.pos_ids.index(POS_VERB)  # just take first verb that appears
+        return (-1 if self.mwe_occur.lang in LANGS_WITH_VERB_OCCURRENCES_ON_RIGHT else 0)
 
     def _i_subhead(self):
         r"""Index of sub-head noun in `likely_canonicform` (very useful for LVCs)."""
-        i_nouns = tuple(i for (i, t) in enumerate(self.tokens) if t.univ_pos == "NOUN")
-        if not i_nouns: return None
+        if POS_NOUN not in self.pos_ids: return None
         # We look for the first noun that is not the modifier in a noun compound
-        head_nouns = [i for i in i_nouns if (i==len(self.tokens)-1 or self.tokens[i+1] != "NOUN")]
-        return head_nouns[0]
+        P, i_last = self.pos_ids, len(self.pos_ids) - 1
+        return next(i for (i, pos) in enumerate(P) if pos == POS_NOUN and (i == i_last or P[i+1] != POS_NOUN))
 
     def _i_synroot(self):
         r"""Yield index of the syntactic roots."""
-        i_nouns = tuple(i for (i, t) in enumerate(self.tokens) if t.univ_pos == "NOUN")
-        if not i_nouns: return None
-        # We look for the first noun that is not the modifier in a noun compound
-        head_nouns = [i for i in i_nouns if (i==len(self.tokens)-1 or self.tokens[i+1] != "NOUN")]
-        return head_nouns[0]
+        return self._i_subhead()
 
     def _i_reflpron(self):
         r"""Return the reflexive pronoun (for IRVs), or None."""
-        return next((i for (i, t) in enumerate(self.tokens) if t.univ_pos == "PRON"), None)
+        return self.pos_ids.index(POS_PRON) if POS_PRON in self.pos_ids else None
 
-    def _likely_canonicform(self):
+    def _calc_likely_canonicform(self):
         r"""Return a lemmatized form of this MWE."""
         if self.mwe_occur.lang in LANGS_WITH_ALL_CANONICAL_TOKENS_LEMATIZED:
             return self.likely_lemmatizedform
@@ -711,48 +892,51 @@ class MWEOccurView:
         ret = [t.surface for t in self.tokens]
         for i in indexes:
             ret[i] = self.tokens[i].lemma_or_surface()
-        return tuple(x.casefold() for x in ret)
+        return tuple(map(str.casefold, ret))
 
 
     def _with_fixed_tokens(self):
-        r"""Return a fixed version of `self.tokens` (must keep same length & order)."""
+        r"""Return a fixed version of `self.tokens` (must keep same length & order).
+        Returns `self` if no token needs fixing (the common case).
+        """
         fixed = tuple(self._fixed_token(t) for t in self.tokens)
-        return MWEOccurView(self.mwe_occur, fixed)
+        if all(map(operator.is_, fixed, self.tokens)):
+            return self
+        # (`_fixed_token` keeps the POS, and hence the head/subhead indexes)
+        return MWEOccurView(self.mwe_occur, fixed, self.pos_ids, (self.i_head, self.i_subhead))
 
     def _fixed_token(self, token):
         r"""Return a manually fixed version of `token` (e.g. homogenize lemmas for IRVs)."""
         if token.univ_pos == "PRON" and Categories.is_inherently_reflexive_verb(self.mwe_occur.category):
             # Normalize reflexive pronouns, e.g. FR "me" or "te" => "se"
-            if self.mwe_occur.lang in ["PT", "ES", "FR"]:
-                token = token.with_update(LEMMA="se")
-            if self.mwe_occur.lang == "IT":
-                token = token.with_update(LEMMA="si")
-            if self.mwe_occur.lang == "EN":
-                token = token.with_update(LEMMA="oneself")
+            refl_lemma = REFL_PRON_CANONICAL_LEMMA.get(self.mwe_occur.lang)
+            if refl_lemma:
+                token = token.with_update(LEMMA=refl_lemma)
         return token
 
 
     def _with_reordered_tokens(self):
         r"""Return a reordered version of `tokens` (must keep same length)."""
         lang, category = self.mwe_occur.lang, self.mwe_occur.category
-        T, newT, iH, iS = self.tokens, list(self.tokens), self.i_head, self.i_subhead
+        T, iH, iS = self.tokens, self.i_head, self.i_subhead
+        P, order = self.pos_ids, list(range(len(self.tokens)))  # new index => old index
         if Categories.is_light_verb_construction(category):
             # Reorder e.g. EN "shower take(n)" => "take shower"
             nounverb = (lang in LANGS_WITH_CANONICAL_VERB_ON_RIGHT)
             if iS is None:
                 iS = 0 if nounverb else len(T)-1
             if (nounverb and iH < iS) or (not nounverb and iS < iH):
-                newT[iH], newT[iS] = T[iS], T[iH]
+                order[iH], order[iS] = iS, iH
 
         if Categories.is_inherently_reflexive_verb(category):
             # Reorder e.g. PT "se suicidar" => "suicidar se"
             iPron, iVerb = ((0,-1) if (lang in LANGS_WITH_CANONICAL_REFL_PRON_ON_LEFT) else (-1,0))
-            if T[iVerb].univ_pos == "PRON" and T[iPron].univ_pos == "VERB":
-                newT[iVerb], newT[iPron] = T[iPron], T[iVerb]
-            elif lang == "PT" and (T[iVerb].univ_pos == "PART" or T[iVerb].univ_pos == "CONJ") and T[iPron].univ_pos == "VERB":
-                newT[iVerb], newT[iPron] = T[iPron], T[iVerb]
+            if P[iVerb] == POS_PRON and P[iPron] == POS_VERB:
+                order[iVerb], order[iPron] = order[iPron], order[iVerb]
+            elif lang == "PT" and (P[iVerb] == POS_PART or P[iVerb] == POS_CONJ) and P[iPron] == POS_VERB:
+                order[iVerb], order[iPron] = order[iPron], order[iVerb]
 
-        return MWEOccurView(self.mwe_occur, newT)
+        return MWEOccurView(self.mwe_occur, tuple(T[i] for i in order), [P[i] for i in order])
 
 
     def iter_root_to_leaf_mwe_tokens(self):
@@ -841,21 +1025,24 @@ class MWELexicalItem:
     @param i_head: index of head verb
     @type  i_subhead: Optional[int]
     @param i_subhead: index of sub-head noun
+    @type  category_counter: collections.Counter
+    @param category_counter: number of mweoccurs per category (read-only!)
     '''
     def __init__(self, mweoccurs: list):
         self.mweoccurs = mweoccurs
-        self.canonicform = most_common(m.reordered.likely_canonicform for m in mweoccurs)
+        self.category_counter = collections.Counter(m.category for m in mweoccurs)
         self._seen_mweoccur_ids = {m.mweo_id() for m in self.mweoccurs}  # type: set[str]
 
-        self.i_head = most_common(m.reordered.i_head for m in mweoccurs)
-        nounbased_mweos = [m.reordered.i_subhead for m in mweoccurs
-                           if m.reordered.i_subhead is not None]
-        self.i_subhead = most_common(nounbased_mweos, fallback=None)
+        views = [m.reordered for m in mweoccurs]
+        self.canonicform = most_common([v.likely_canonicform for v in views])
+        self.i_head = most_common([v.i_head for v in views])
+        self.i_subhead = most_common([v.i_subhead for v in views if v.i_subhead is not None], fallback=None)
 
 
     def only_non_vmwes(self):
         r'''True iff all mweoccurs are NonVMWEs.'''
-        return all((o.category in Categories.NON_MWES and o.metadata.confidence is None) for o in self.mweoccurs)
+        return self.category_counter.keys() <= Categories.NON_MWES \
+            and all(o.metadata.confidence is None for o in self.mweoccurs)
 
     def contains_mweoccur(self, mweoccur):
         r'''True iff self.mweoccurs contains given MWEOccur.'''
@@ -868,6 +1055,7 @@ class MWELexicalItem:
         if not any(mweoccur.suspiciously_similar(m) for m in self.mweoccurs):
             self._seen_mweoccur_ids.add(mweoccur_id)
             self.mweoccurs.append(mweoccur)
+            self.category_counter[mweoccur.category] += 1
 
     def head(self):
         r'''Return a `str` with the head verb.'''
@@ -916,20 +1104,14 @@ def most_common(iterable, *, fallback=_FALLBACK_RAISE):
     r'''Utility function: Return most common element in `iterable`.
     Return `fallback` if `iterable` is empty.
     '''
-    a_list = collections.Counter(iterable).most_common(1)
-    if a_list:
-        return a_list[0][0]
+    counts = collections.Counter(iterable)
+    if counts:  # (same as `counts.most_common(1)[0][0]`, without sorting: ties go to the first element seen)
+        return max(counts, key=counts.__getitem__)
 
     assert fallback is not _FALLBACK_RAISE, 'Zero elements to choose from; no fallback provided'
     return fallback
 
 
-class FrozenCounter(collections.Counter):
-    r'''Instance of Counter that can be hashed. Should not be modified.'''
-    def __hash__(self):
-        return hash(frozenset(self.items()))
-
-
 
 ############################################################
 
@@ -940,14 +1122,15 @@ PATH_FMTS = ["{d}/{b}.conllu", "{d}/conllu/{b}.conllu"]
 def calculate_conllu_paths(file_paths, warn=True):
     r"""Return CoNLL-U paths, or None on failure to find some of them."""
     ret = []
+    dir2filenames = {}  # type: dict[str, Optional[set[str]]]
     for file_path in file_paths:
         dirname, basename = os.path.split(file_path)
         if not dirname: dirname = "."  # seriously, python...
 
         basename = basename_without_ext(basename)
-        for path_fmt in ["{d}/{b}.conllu", "{d}/conllu/{b}.conllu"]:
+        for path_fmt in PATH_FMTS:
             ret_path = path_fmt.format(d=dirname, b=basename)
-            if os.path.exists(ret_path):
+            if _path_exists(ret_path, dir2filenames):
                 if warn:
                     do_warn("Using CoNLL-U file `{p}`", p=ret_path, warntype="INFO")
                 ret.append(ret_path)
@@ -961,18 +1144,38 @@ def calculate_conllu_paths(file_paths, warn=True):
     return ret
 
 
-RE_BASENAME_NOEXT = re.compile(
-    r'^(?:.*/)*(.*?)(\.(folia|xml|conllu|conllup|cupt|parsemetsv|tsv|tar|gz|bz2|zip))*$')
+def _path_exists(path, dir2filenames):
+    r"""Return True iff `path` exists.
+    Each directory is listed only once, and the listing is cached in `dir2filenames`.
+    """
+    dirname, filename = os.path.split(path)
+    if dirname not in dir2filenames:
+        try:
+            with os.scandir(dirname) as entries:
+                dir2filenames[dirname] = {entry.name for entry in entries}
+        except OSError:
+            dir2filenames[dirname] = None  # e.g. directory does not exist
+    filenames = dir2filenames[dirname]
+    return os.path.exists(path) if filenames is None else (filename in filenames)
+
+
+# File extensions removed by `basename_without_ext` (a tuple, as expected by `str.endswith`)
+KNOWN_FILE_EXTS = tuple("." + ext for ext in "folia xml conllu conllup cupt parsemetsv tsv tar gz bz2 zip".split())
 
 def basename_without_ext(filepath):
     r"""Return the basename of `filepath` without any known extensions."""
-    return RE_BASENAME_NOEXT.match(filepath).group(1)
+    basename = filepath.rsplit("/", 1)[-1]
+    while basename.endswith(KNOWN_FILE_EXTS):
+        basename = basename.rsplit(".", 1)[0]
+    return basename
 
 
 #####################################################################
 
 class IterAlignedFiles:
-    r"""Class that yields Sentence instances based on file_paths and conllu_paths."""
+    r"""Class that yields Sentence instances based on file_paths and conllu_paths.
+    Sentences are read lazily; each new iteration reads the files again (except for stdin).
+    """
     def __init__(
             self, lang: str, file_paths: list, conllu_paths=None,
             *, keep_nvmwes=False, default_mwe_category=None,
@@ -980,12 +1183,17 @@ class IterAlignedFiles:
         self.keep_nvmwes = keep_nvmwes
         self.keep_dup_mwes = keep_dup_mwes
         self.keep_mwe_random_order = keep_mwe_random_order
-        self.aligned_iterator = AlignedIterator.from_paths(
-            lang, file_paths, conllu_paths, default_mwe_category=default_mwe_category, debug=debug)
+        for file_path in itertools.chain(file_paths, conllu_paths or ()):
+            if file_path != "-":
+                open(file_path, 'rb').close()  # (files are only read when iterating; fail early on bad paths)
+        self.new_aligned_iterator = functools.partial(AlignedIterator.from_paths,
+            lang, file_paths, conllu_paths, default_mwe_category=default_mwe_category, debug=debug,
+            align_file_pairs=N_WORKERS > 1)
 
     def __iter__(self):
-        for sentence in self.aligned_iterator:
-            assert isinstance(sentence, Sentence)
+        aligned_iterator = self.new_aligned_iterator()  # (AlignedIterator instances can only be iterated once)
+        for sentence in aligned_iterator:
+            assert type(sentence) is Sentence  # (cheaper than isinstance; there are no subclasses of Sentence)
             if not self.keep_nvmwes:
                 sentence.remove_non_vmwes()
             if not self.keep_dup_mwes:
@@ -1022,34 +1230,37 @@ def _iter_parseme_file(lang, file_path, default_mwe_category):
 
 
 class AlignedIterator:
-    r"""Yield Sentence instances based on the given iterators."""
+    r"""Yield Sentence instances based on the given iterators.
+    Sentences are read lazily, so an instance can only be iterated once
+    (use `IterAlignedFiles` to iterate over the same files multiple times).
+    """
     def __init__(self, main_iterators: list, conllu_iterators: 'Optional[list]', debug=False):
         self.main_iterators = main_iterators
         self.conllu_iterators = conllu_iterators
-        self.main = collections.deque(itertools.chain.from_iterable(main_iterators))
-        self.conllu = collections.deque(itertools.chain.from_iterable(conllu_iterators)) if conllu_iterators else None
+        # Sentences are parsed lazily, as they are requested (we never hold whole files in memory)
+        self.main = itertools.chain.from_iterable(main_iterators)
+        self.conllu = itertools.chain.from_iterable(conllu_iterators) if conllu_iterators else None
         self.debug = debug
 
     def __iter__(self):
         if self.conllu_iterators is None:
-            yield from iter(self.main)
+            yield from self.main
             return
 
-        while self.main or self.conllu:
-            _warn_if_none(
-                self.main[0] if self.main else None,
-                self.conllu[0] if self.conllu else None)
-            main_s = self.main.popleft()
-            conllu_s = self.conllu.popleft()
+        for main_s, conllu_s in itertools.zip_longest(self.main, self.conllu):
+            _warn_if_none(main_s, conllu_s)
 
             if conllu_s:
                 # Ignore all ToplevelComments in TSV (do NOT yield them)
                 # Yield ToplevelComments in from CoNLL-U instead
                 main_s.kv_pairs = conllu_s.kv_pairs
 
-            tok_aligner = TokenAligner(main_s, conllu_s, debug=self.debug)
-            indexmap = tok_aligner.index_mapping(main_s, conllu_s)
-            main_s.re_tokenize(conllu_s.tokens, indexmap)
+            if main_s.surfaces == conllu_s.surfaces:
+                indexmap = {}  # Common case: same tokenization, nothing to align
+            else:
+                tok_aligner = TokenAligner(main_s, conllu_s, debug=self.debug)
+                indexmap = tok_aligner.index_mapping(main_s, conllu_s)
+            main_s.re_tokenize(conllu_s, indexmap)
             yield main_s
 
 
@@ -1067,16 +1278,92 @@ class AlignedIterator:
 
 
     @staticmethod
-    def from_paths(lang: str, main_paths, conllu_paths, *, default_mwe_category=None, debug=False):
+    def from_paths(lang: str, main_paths, conllu_paths, *, default_mwe_category=None, debug=False,
+                   align_file_pairs=False):
         r"""Return an AlignedIterator for the given paths.
-        (Special case: if conllu_paths is None, return a simpler kind of iterator)."""
-        chain_iter = itertools.chain.from_iterable
-        main_iterators = [_iter_parseme_file(lang, p, default_mwe_category) for p in main_paths]
+        (Special case: if conllu_paths is None, return a simpler kind of iterator).
+
+        If `align_file_pairs` is True and there is one CoNLL-U file per main file,
+        each (main_path, conllu_path) pair is aligned on its own (in parallel, see `_iter_parsed_files`).
+        The returned iterator then has `conllu = None` (its `main` yields aligned sentences),
+        and sentences are never aligned across file boundaries.
+        """
+        if align_file_pairs and conllu_paths and len(conllu_paths) == len(main_paths) > 1 \
+                and "-" not in main_paths:
+            align_pair = functools.partial(_align_file_pair, debug=debug)
+            path_pairs = list(zip(main_paths, conllu_paths))
+            return AlignedIterator(_iter_parsed_files(align_pair, lang, path_pairs, default_mwe_category), None, debug)
+
+        main_iterators = _iter_parsed_files(_iter_parseme_file, lang, main_paths, default_mwe_category)
         conllu_iterators = None if not conllu_paths else \
-            [ConlluIterator(CorpusInfo(lang, p, None), open(p, 'r', encoding="utf-8"), default_mwe_category) for p in conllu_paths]
+            _iter_parsed_files(_iter_conllu_file, lang, conllu_paths, default_mwe_category)
         return AlignedIterator(main_iterators, conllu_iterators, debug)
 
 
+def _iter_conllu_file(lang, file_path, default_mwe_category):
+    return ConlluIterator(CorpusInfo(lang, file_path, None), open(file_path, 'r', encoding="utf-8"), default_mwe_category)
+
+
+def _align_file_pair(lang, path_pair, default_mwe_category, *, debug=False):
+    main_path, conllu_path = path_pair
+    return AlignedIterator([_iter_parseme_file(lang, main_path, default_mwe_category)],
+                           [_iter_conllu_file(lang, conllu_path, default_mwe_category)], debug)
+
+
+def _iter_parsed_files(iter_file, lang, file_paths, default_mwe_category):
+    r"""Yield one iterable of Sentence's for each file in `file_paths` (in order).
+    When there are 2+ files and N_WORKERS > 1, they are parsed in parallel by a pool of worker processes
+    (at most one parsed file per worker is kept waiting in memory). The warnings of each file
+    are then printed by the main process, in file order, right before its sentences are yielded.
+    """
+    n_workers = min(len(file_paths), N_WORKERS)
+    if n_workers < 2 or "-" in file_paths:
+        for file_path in file_paths:
+            yield iter_file(lang, file_path, default_mwe_category)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(n_workers) as executor:
+        futures = collections.deque()
+        for file_path in file_paths:
+            futures.append(executor.submit(_parsed_file, iter_file, lang, file_path, default_mwe_category))
+            if len(futures) > n_workers:
+                yield _iter_worker_result(futures.popleft())
+        while futures:
+            yield _iter_worker_result(futures.popleft())
+
+
+def _parsed_file(iter_file, lang, file_path, default_mwe_category):
+    r"""Return (list of Sentence's in file, warnings printed while parsing it).
+    (Runs inside a worker process; `warn_once` state is reset, so that the warnings
+    of a file do not depend on which other files were parsed by the same worker).
+    """
+    _WARNED.clear()
+    warnings = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(warnings):
+            sentences = list(iter_file(lang, file_path, default_mwe_category))
+    except BaseException:
+        sys.stderr.write(warnings.getvalue())
+        raise
+    return sentences, warnings.getvalue()
+
+
+def _iter_worker_result(future):
+    r"""Print the warnings of a `_parsed_file` result and return an iterator over its sentences."""
+    sentences, warnings = future.result()
+    sys.stderr.write(warnings)
+    return _iter_releasing(sentences)
+
+
+def _iter_releasing(sentences: list):
+    r"""Yield (and remove) all elements of `sentences`, in order.
+    Elements that were already yielded can be garbage-collected before the end of the list.
+    """
+    sentences.reverse()
+    while sentences:
+        yield sentences.pop()
+
+
 def _warn_if_none(main_sentence, conllu_sentence):
     assert conllu_sentence or main_sentence
 
@@ -1088,15 +1375,39 @@ def _warn_if_none(main_sentence, conllu_sentence):
                 "no matching CoNLL-U input file", n=main_sentence.nth_sent, error=True)
 
 
+def matching_blocks(seq_a, seq_b):
+    r"""Return a list of (i, j, size) triples with the matching blocks of both sequences
+    (same output as `difflib.SequenceMatcher.get_matching_blocks`, including the final sentinel).
+    """
+    if len(seq_a) == len(seq_b) and all(map(operator.eq, seq_a, seq_b)):
+        n = len(seq_a)  # Common case: nothing to align
+        return [(0, 0, n), (n, n, 0)] if n else [(0, 0, 0)]
+    align_numba = _import_align_numba()
+    if align_numba and len(seq_b) < align_numba.AUTOJUNK_MIN_LEN:
+        return align_numba.matching_blocks(seq_a, seq_b)
+    return difflib.SequenceMatcher(None, seq_a, seq_b).get_matching_blocks()
+
+
+@functools.lru_cache(maxsize=1)
+def _import_align_numba():
+    r"""Return the optional `_align_numba` module (compiled token alignment), or None if Numba is missing.
+    (Imported on first use: Numba is slow to import, and most runs never need to align tokens).
+    """
+    try:
+        import _align_numba
+    except ImportError:
+        return None
+    return _align_numba
+
+
 class SentenceAligner:
     def __init__(self, main_sentences, conllu_sentences, debug=False):
         self.main_sentences = list(main_sentences)
         self.conllu_sentences = list(conllu_sentences)
         self.debug = debug
-        main_surfs = [tuple(t.surface for t in sent.tokens) for sent in self.main_sentences]
-        conllu_surfs = [tuple(t.surface for t in sent.tokens) for sent in self.conllu_sentences]
-        sm = difflib.SequenceMatcher(None, main_surfs, conllu_surfs)
-        self.matches_end = sm.get_matching_blocks()
+        main_surfs = [tuple(sent.surfaces) for sent in self.main_sentences]
+        conllu_surfs = [tuple(sent.surfaces) for sent in self.conllu_sentences]
+        self.matches_end = matching_blocks(main_surfs, conllu_surfs)
         self.matches_beg = [(0, 0, 0)] + self.matches_end
 
     def print_mismatches(self):
@@ -1152,10 +1463,7 @@ class TokenAligner:
         self.main_sentence = main_sentence
         self.conllu_sentence = conllu_sentence
         self.debug = debug
-        main_surf = [t.surface for t in main_sentence.tokens]
-        conllu_surf = [t.surface for t in conllu_sentence.tokens]
-        sm = difflib.SequenceMatcher(None, main_surf, conllu_surf)
-        self.matches_end = sm.get_matching_blocks()
+        self.matches_end = matching_blocks(main_sentence.surfaces, conllu_sentence.surfaces)
         self.matches_beg = [(0, 0, 0)] + self.matches_end
 
 
@@ -1163,14 +1471,13 @@ class TokenAligner:
         r"""Return a dict {i_main -> list[i_conllu]}"""
         if not self.is_alignable():
             self.msg_unalignable(error=True)
-        indexmap = collections.defaultdict(list)
+        indexmap = {}  # (each i_main is in exactly one of the ranges below)
         for info, range_main, range_conllu in self._triples():
             if info == "EQUAL":
-                for iM, iC in zip(range_main, range_conllu):
-                    indexmap[iM].append(iC)
+                indexmap.update(zip(range_main, ([iC] for iC in range_conllu)))
             else:
                 for iM in range_main:
-                    indexmap[iM].extend(range_conllu)
+                    indexmap[iM] = list(range_conllu)
                 self.warn_mismatch(range_main, range_conllu)
         return indexmap
 
@@ -1186,18 +1493,21 @@ class TokenAligner:
 
 
     def is_alignable(self):
-        r"""Return True iff the sentences are alignable."""
-        for info, main_range, conllu_range in self._triples():
-            if info == "MISMATCH" and len(main_range) > 10:
-                return False
-        return True
+        r"""Return True iff the sentences are alignable (no gap in main is longer than 10 tokens)."""
+        return all(main2 - (main1+size1) <= 10 for (main1, _, size1), (main2, _, _)
+                   in zip(self.matches_beg, self.matches_end))
 
 
     def warn_mismatch(self, range_gap_main, range_gap_conllu):
         r"""Warn users when the two ranges do not match (one or both ranges may be empty)."""
         if range_gap_main:
-            affected_mweids = [mwe_i+1 for (mwe_i, m) in enumerate(self.main_sentence.mweoccurs) \
-                    if any((token_i in m.indexes) for token_i in range_gap_main)]
+            try:
+                main_tokenindex2mweindexes = self._main_tokenindex2mweindexes
+            except AttributeError:  # (calculated once, for all gaps in this sentence)
+                main_tokenindex2mweindexes = self._main_tokenindex2mweindexes = \
+                        self.main_sentence.tokenindex2mweindexes()
+            affected_mweids = sorted(set(mwe_i+1 for token_i in range_gap_main
+                                         for mwe_i in (main_tokenindex2mweindexes[token_i] or ())))
             self.warn_gap_main(range_gap_main, range_gap_conllu, affected_mweids)
 
         if range_gap_conllu:
@@ -1235,6 +1545,19 @@ class FoliaIterator:
     r"""Yield Sentence's for file_path."""
     XML_CONLLUP_SEP = "`"  # one-byte separator that is easier to read than a tab
 
+    # XML tags that we know how to read without building the FoliaPY DOM
+    # (see `is_streamable_metadata` and `is_streamable_sentence`)
+    STREAMABLE_TAGS = frozenset(["FoLiA", "metadata", "annotations", "meta", "text", "div", "p", "head",
+            "s", "w", "t", "foreign-data", "conllup-columns", "kv-pair", "comment", "desc",
+            "entities", "entity", "wref", "pos", "lemma"])
+    # XML attributes that we do not know how to read (provenance and space-preserving text)
+    NONSTREAMABLE_ATTRIBS = frozenset(["processor", "{http://www.w3.org/XML/1998/namespace}space"])
+    # Attributes of annotation declarations that set defaults for all annotations of that type
+    DECLARATION_DEFAULT_ATTRIBS = frozenset(["annotator", "annotatortype", "datetime"])
+
+    class NotStreamable(Exception):
+        r"""Raised by `_iter_streamed` when the document uses FoLiA features that it cannot read."""
+
     def __init__(self, corpusinfo, fileobj):
         self.fileobj = fileobj
         self.corpusinfo = corpusinfo
@@ -1247,7 +1570,169 @@ class FoliaIterator:
         do_warn(msg_fmt, prefix=prefix, **kwargs)
 
     def __iter__(self):
-        doc = folia.Document(string=self.fileobj.read())
+        r"""Yield Sentence's, streaming the XML with lxml (see `_iter_streamed`).
+        If the document uses FoLiA features that cannot be streamed, the remaining
+        sentences are read from a `folia.Document` instead.
+        """
+        with self.fileobj:
+            try:  # Regular files are memory-mapped (streamed files are never fully loaded in memory)
+                xml_data = mmap.mmap(self.fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError, io.UnsupportedOperation):
+                xml_data = self.fileobj.read()  # e.g. pipes or empty files
+
+        n_streamed = 0
+        try:
+            for sentence in self._iter_streamed(xml_data):
+                n_streamed += 1
+                yield sentence
+            return
+        except FoliaIterator.NotStreamable:
+            pass
+        xml_string = xml_data if isinstance(xml_data, str) else str(xml_data, 'utf-8')
+        yield from self._iter_folia_document(xml_string, n_skipped=n_streamed)
+
+    @staticmethod
+    def is_streamable_metadata(xml_metadata: etree._Element) -> bool:
+        r"""Return True iff the <metadata> header can be read by `_iter_streamed`
+        (no provenance, no annotation defaults in the declarations...).
+        """
+        for elem in xml_metadata.iter(etree.Element):
+            localname = etree.QName(elem).localname
+            if localname.endswith("-annotation"):
+                if not FoliaIterator.DECLARATION_DEFAULT_ATTRIBS.isdisjoint(elem.attrib):
+                    return False
+            elif localname not in FoliaIterator.STREAMABLE_TAGS:
+                return False
+            if not FoliaIterator.NONSTREAMABLE_ATTRIBS.isdisjoint(elem.attrib):
+                return False
+        return True
+
+    @staticmethod
+    def is_streamable_sentence(xml_sentence: etree._Element) -> bool:
+        r"""Return True iff the <s> element can be read by `_iter_streamed`
+        (not inside corrections/alternatives, no text markup, no non-current text...).
+        """
+        for elem in itertools.chain(xml_sentence.iterancestors(), xml_sentence.iter(etree.Element)):
+            if etree.QName(elem).localname not in FoliaIterator.STREAMABLE_TAGS \
+                    or not FoliaIterator.NONSTREAMABLE_ATTRIBS.isdisjoint(elem.attrib):
+                return False
+        return all(not xml_text.attrib for xml_text in xml_sentence.iter(_XML_FOLIA_TAG['t']))
+
+
+    def _iter_streamed(self, xml_data):
+        r"""Yield Sentence's by streaming the XML with lxml (sentences are discarded once read).
+        The XML can be given as a `str` or as UTF-8 bytes (e.g. an `mmap`, which is read as a file).
+        Raise NotStreamable (before yielding the sentence in question) if the root is not
+        a FoLiA element, or if `is_streamable_metadata` or `is_streamable_sentence` is False.
+        """
+        T = _XML_FOLIA_TAG
+        self.colnames = None
+        if isinstance(xml_data, str):
+            xml_data = xml_data.encode('utf-8')
+        xml_file = xml_data if isinstance(xml_data, mmap.mmap) else io.BytesIO(xml_data)
+        del xml_data  # (only `xml_file` is kept while streaming)
+        xml_events = etree.iterparse(xml_file, events=('start', 'end'),
+                                     tag=(T['FoLiA'], T['metadata'], T['s'], T['entities']))
+        seen_root, seen_metadata = False, False
+        for event, elem in xml_events:
+            if elem.tag == T['FoLiA']:
+                if elem.getparent() is not None:
+                    raise FoliaIterator.NotStreamable(elem.tag)
+                seen_root = True
+
+            elif event == 'start':
+                pass  # (other elements are only read once complete)
+
+            elif elem.tag == T['metadata']:
+                if not (seen_root and self.is_streamable_metadata(elem)):
+                    raise FoliaIterator.NotStreamable(elem.tag)
+                seen_metadata = True
+                if elem.get('type', 'native') == 'native':
+                    for meta in elem.iterchildren(T['meta']):
+                        if meta.get('id') == 'conllup-colnames':
+                            self.colnames = (meta.text or "").split(FoliaIterator.XML_CONLLUP_SEP)
+
+            elif elem.tag == T['entities']:
+                if elem.getparent().tag == T['text']:
+                    for xml_entity in elem.iterchildren(T['entity']):
+                        self.do_warn('Ignoring MWE outside the scope of a single sentence: {id!r}', id=xml_entity.get(_XML_ID))
+
+            else:
+                if not (seen_metadata and self.is_streamable_sentence(elem)):
+                    raise FoliaIterator.NotStreamable(elem.tag)
+                self.nth_sent = (self.nth_sent or 0) + 1
+                current_sentence = Sentence(self.corpusinfo, self.nth_sent, None)
+                word_id2index = {}
+                for rank, xml_word in enumerate(elem.iter(T['w']), 1):
+                    word_id2index[xml_word.get(_XML_ID)] = rank - 1
+                    xml_text = xml_word.find(T['t'])
+                    tokendict = {
+                        'ID': str(rank),
+                        'FORM': (self.folia_text(xml_text.text) if xml_text is not None else '') or '_',
+                        'MISC': ('SpaceAfter=No' if xml_word.get('space', 'yes') in ('no', '') else ''),
+                    }
+                    if self.colnames:
+                        self.update_from_conllup_columns(tokendict, xml_word.iterchildren(T['foreign-data']))
+                    current_sentence.append_token(Token.from_str_pairs(tokendict.items()))
+
+                for child in elem.iterchildren(T['foreign-data'], T['comment']):
+                    if child.tag == T['comment']:
+                        current_sentence.kv_pairs.append(Metadata.from_folia_xml(child))
+                    else:
+                        self.append_kv_pairs(current_sentence, child)
+
+                for xml_entity in elem.iter(T['entity']):
+                    self.append_mweoccur(current_sentence, word_id2index, xml_entity.get(_XML_ID),
+                                         xml_entity.get('class'), self.xml_wref_ids(xml_entity),
+                                         Metadata.from_folia_xml, xml_entity)
+
+                # Free the memory of this sentence (and of the ones before it)
+                elem.clear(keep_tail=True)
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+                yield current_sentence
+
+        if not seen_root:
+            raise FoliaIterator.NotStreamable()  # (let `folia.Document` report what is wrong)
+
+    @staticmethod
+    def folia_text(raw_text: str) -> str:
+        r"""Return the text in a <t> tag, with spaces normalized as in `folia.Word.text()`."""
+        if raw_text and raw_text.isprintable() and "  " not in raw_text \
+                and raw_text[0] != " " and raw_text[-1] != " " and unicodedata.is_normalized('NFC', raw_text):
+            return raw_text  # Common case: nothing to normalize (no control chars or extra whitespace)
+        lines = (unicodedata.normalize('NFC', folia.norm_spaces(line)) for line in (raw_text or "").split("\n"))
+        return " ".join(line for line in lines if line)
+
+    @staticmethod
+    def folia_word_text(word: folia.Word) -> str:
+        r"""Return `word.text()` (skipping FoliaPY's generic text lookup in the common case of a single <t>)."""
+        text_elems = [e for e in word.data if isinstance(e, folia.TextContent)]
+        if len(text_elems) == 1:
+            text_elem = text_elems[0]
+            if text_elem.cls == 'current' and not text_elem.preservespace \
+                    and len(text_elem.data) == 1 and isinstance(text_elem.data[0], str) \
+                    and not any(isinstance(e, _FOLIA_TEXT_FROM_CHILDREN) for e in word.data):
+                return FoliaIterator.folia_text(text_elem.data[0])
+        return word.text()
+
+    @staticmethod
+    def xml_wref_ids(xml_entity: etree._Element) -> list:
+        r"""Return the word IDs in the <wref> tags of `xml_entity` (same as `folia.Entity.wrefs()`)."""
+        ret = []
+        for child in xml_entity.iterchildren(_XML_FOLIA_TAG['wref'], _XML_FOLIA_TAG['entity']):
+            if child.tag == _XML_FOLIA_TAG['wref']:
+                ret.append(child.get('id'))
+            else:
+                ret.extend(FoliaIterator.xml_wref_ids(child))
+        return ret
+
+
+    def _iter_folia_document(self, xml_string: str, *, n_skipped=0):
+        r"""Yield Sentence's from a `folia.Document` (supports all of FoLiA, but loads the whole DOM).
+        The first `n_skipped` sentences are not yielded (they were already read by `_iter_streamed`).
+        """
+        doc = folia.Document(string=xml_string)
         doc.filename = self.fileobj
         self.colnames = None if "conllup-colnames" not in doc.metadata \
                 else doc.metadata["conllup-colnames"].split(FoliaIterator.XML_CONLLUP_SEP)
@@ -1257,63 +1742,86 @@ class FoliaIterator:
                 self.do_warn('Ignoring MWE outside the scope of a single sentence: {id!r}', id=folia_nonembedded_entity.id)
 
         for self.nth_sent, folia_sentence in enumerate(doc.select(folia.Sentence), 1):
+            if self.nth_sent <= n_skipped:
+                continue
             current_sentence = Sentence(self.corpusinfo, self.nth_sent, None)
+            word_id2index = {}
             for rank, word in enumerate(folia_sentence.words(), 1):
+                word_id2index[word.id] = rank - 1
                 tokendict = {
                     'ID': str(rank),
-                    'FORM': word.text() or '_',
+                    'FORM': self.folia_word_text(word) or '_',
                     'MISC': ('' if word.space else 'SpaceAfter=No'),
                 }
                 if self.colnames:
-                    for foreign in word.select(folia.ForeignData):
-                        for _xmltag, kv_elem in self.foreign_tag_elems(foreign, ["conllup-columns"]):
-                            cols_str = kv_elem.attrib["columns"]
-                            cols = [c.replace(FoliaIterator.XML_CONLLUP_SEP, "\t")
-                                    for c in cols_str.split(FoliaIterator.XML_CONLLUP_SEP)]
-                            tokendict2 = {k: v for (k, v) in zip(self.colnames, cols) if v != "_"}
-                            tokendict2.pop("PARSEME:MWE", None)  # drop this info, if existent
-                            tokendict.update(tokendict2)
-                current_sentence.tokens.append(Token(tokendict))
+                    self.update_from_conllup_columns(
+                        tokendict, (foreign.node for foreign in word.select(folia.ForeignData)))
+                current_sentence.append_token(Token.from_str_pairs(tokendict.items()))
 
             self.iter_kv_pairs(current_sentence, folia_sentence)
             folia_mwes = list(folia_sentence.select(folia.Entity))
-            self.calc_mweoccurs(current_sentence, folia_mwes, folia_sentence)
+            self.calc_mweoccurs(current_sentence, folia_mwes, word_id2index)
             yield current_sentence
 
 
+    def update_from_conllup_columns(self, tokendict: dict, foreign_nodes):
+        r"""Update `tokendict` with the <conllup-columns> in the <foreign-data> nodes of a word."""
+        for foreign_node in foreign_nodes:
+            for _xmltag, kv_elem in self.foreign_tag_elems(foreign_node, ["conllup-columns"]):
+                cols_str = kv_elem.attrib["columns"]
+                cols = [c.replace(FoliaIterator.XML_CONLLUP_SEP, "\t")
+                        for c in cols_str.split(FoliaIterator.XML_CONLLUP_SEP)]
+                tokendict2 = {k: v for (k, v) in zip(self.colnames, cols) if v != "_"}
+                tokendict2.pop("PARSEME:MWE", None)  # drop this info, if existent
+                tokendict.update(tokendict2)
+
+
     def iter_kv_pairs(self, output_sentence: Sentence, folia_sentence):
         r"""Append instances of KVPair (or subclasses) to `output_sentence.kv_pairs`."""
-        conllup_columns = []
         for fdata in folia_sentence.select((folia.ForeignData, folia.Comment), recursive=False):
             if isinstance(fdata, folia.Comment):
                 output_sentence.kv_pairs.append(Metadata.from_folia(fdata))
             else:
-                for _xmltag, kv_elem in self.foreign_tag_elems(fdata, ["kv-pair"]):
-                    output_sentence.kv_pairs.append(KVPair(kv_elem.attrib["key"], kv_elem.attrib["value"]))
+                self.append_kv_pairs(output_sentence, fdata.node)
 
+    def append_kv_pairs(self, output_sentence: Sentence, foreign_node):
+        r"""Append the <kv-pair> tags in the <foreign-data> node to `output_sentence.kv_pairs`."""
+        for _xmltag, kv_elem in self.foreign_tag_elems(foreign_node, ["kv-pair"]):
+            output_sentence.kv_pairs.append(KVPair(kv_elem.attrib["key"], kv_elem.attrib["value"]))
 
-    def calc_mweoccurs(self, output_sentence: Sentence, folia_mwes, folia_sentence):
-        r"""Append instances of `MWEOccur` to `output_sentence.mweoccurs`."""
-        word_id2index = {w.id: i for i, w in enumerate(folia_sentence.words())}
-        sent_word_ids = [w.id for w in folia_sentence.words()]
+
+    def calc_mweoccurs(self, output_sentence: Sentence, folia_mwes, word_id2index: dict):
+        r"""Append instances of `MWEOccur` to `output_sentence.mweoccurs`.
+        The dict `word_id2index` maps the ID of each word in the sentence to its index.
+        """
+        get_id = operator.attrgetter('id')
         for mwe in folia_mwes:
-            mwe_word_ids = [w.id for w in mwe.wrefs()]
-            if not mwe_word_ids:  # ignore empty Entities produced by FLAT
-                output_sentence.warn('Ignoring empty MWE: {id!r}', id=mwe.id)
-            elif any(w.id not in sent_word_ids for w in mwe.wrefs()):
-                output_sentence.warn('Ignoring misplaced MWE: {id!r}', id=mwe.id)
-            else:
-                categ = output_sentence.check_and_convert_categ(mwe.cls)
-                indexes = [word_id2index[w.id] for w in mwe.wrefs()]
-                output_sentence.mweoccurs.append(MWEOccur(
-                    output_sentence, indexes, categ, Metadata.from_folia(mwe)))
+            self.append_mweoccur(output_sentence, word_id2index, mwe.id, mwe.cls,
+                                 list(map(get_id, mwe.wrefs())), Metadata.from_folia, mwe)
+
+    def append_mweoccur(self, output_sentence: Sentence, word_id2index: dict,
+                        mwe_id: str, mwe_cls: str, mwe_word_ids: list, metadata_from, mwe):
+        r"""Append an `MWEOccur` to `output_sentence.mweoccurs` (or warn, if it cannot be read).
+        The metadata is built by calling `metadata_from(mwe)`.
+        """
+        if not mwe_word_ids:  # ignore empty Entities produced by FLAT
+            output_sentence.warn('Ignoring empty MWE: {id!r}', id=mwe_id)
+            return
+        try:
+            indexes = [word_id2index[word_id] for word_id in mwe_word_ids]
+        except KeyError:
+            output_sentence.warn('Ignoring misplaced MWE: {id!r}', id=mwe_id)
+        else:
+            categ = output_sentence.check_and_convert_categ(mwe_cls)
+            output_sentence.mweoccurs.append(MWEOccur(
+                output_sentence, indexes, categ, metadata_from(mwe)))
 
 
-    def foreign_tag_elems(self, foreign: folia.ForeignData, expected_tags: list):
-        r"""Yield (xmltag: str, elem: etree.Element) pairs for foreign elements
+    def foreign_tag_elems(self, foreign_node: etree._Element, expected_tags: list):
+        r"""Yield (xmltag: str, elem: etree.Element) pairs for the children of a <foreign-data> node
         if `tag` is in the list of `expected` tags.
         """
-        for kv_elem in foreign.node.getchildren():
+        for kv_elem in foreign_node.getchildren():
             xmltag = kv_elem.tag.split('}', 1)[-1]
             if xmltag in expected_tags:
                 yield (xmltag, kv_elem)
@@ -1328,6 +1836,12 @@ class AbstractFileIterator:
     @param default_mwe_category: category to use when one is missing (str);
                                  if not specified, raises an error instead
     '''
+    # Max number of splits for each line (one more than the expected number of columns,
+    # so that lines with extra columns are still detected); -1 means unlimited
+    MAXSPLIT = -1
+    # Columns whose values repeat all over the corpus (the same `str` object is shared for each value)
+    INTERNED_COLNAMES = ('ID', 'FORM', 'LEMMA', 'UPOS', 'XPOS', 'FEATS', 'HEAD', 'DEPREL')
+
     def __init__(self, corpusinfo, fileobj, default_mwe_category):
         self.corpusinfo = corpusinfo
         self.fileobj = fileobj
@@ -1344,9 +1858,9 @@ class AbstractFileIterator:
         self.id2mwe_ranks = collections.defaultdict(list)
         self.id2mwe_indexes = collections.defaultdict(list)
 
-    def get_token_and_mwecodes(self, fields: list) -> (Token, list):
-        r"""Return a Token and a list of mwecodes (str)
-        for the list of fields in current line.
+    def get_token_and_mwecodes(self, fields: list) -> (Token, 'Sequence[str]'):
+        r"""Return a Token and a sequence of mwecodes (str)
+        for the list of fields in current line (an empty tuple if there are no mwecodes).
         """
         return NotImplementedError('Abstract method')
 
@@ -1391,27 +1905,44 @@ class AbstractFileIterator:
             #    keyval = KVPair("sent_id", keyval.value)
             self.curr_sent.kv_pairs.append(keyval)
 
-    def append_token(self, line):
-        token, mwecodes = self.get_token_and_mwecodes(line.split("\t"))  # method defined in subclass
+    def n_columns(self, data: list) -> int:
+        r"""Return the number of columns in a line that was split into `data` (at most MAXSPLIT times)."""
+        if self.MAXSPLIT < 0 or len(data) <= self.MAXSPLIT:
+            return len(data)
+        return len(data) + data[-1].count("\t")  # (the last item has all the extra columns, still joined)
 
-        for mwecode in mwecodes:
-            index_and_categ = mwecode.split(":")
-            self.id2mwe_ranks[index_and_categ[0]].append(token.rank)
-            self.id2mwe_indexes[index_and_categ[0]].append(len(self.curr_sent.tokens))
-            if len(index_and_categ) == 2 and index_and_categ[1]:
-                categ = self.curr_sent.check_and_convert_categ(index_and_categ[1])
-                self.id2mwe_categ.setdefault(index_and_categ[0], categ)
-        self.curr_sent.tokens.append(token)
+    def append_token(self, line):
+        r"""Append a Token for given line to `self.curr_sent` (mirrored in `_fastio.pyx`)."""
+        token, mwecodes = self.get_token_and_mwecodes(line.split("\t", self.MAXSPLIT))  # method defined in subclass
+        curr_sent = self.curr_sent
+
+        if mwecodes:
+            rank, index = token.rank, len(curr_sent.tokens)
+            id2mwe_ranks, id2mwe_indexes = self.id2mwe_ranks, self.id2mwe_indexes
+            for mwecode in mwecodes:
+                mwe_id, _, categ = mwecode.partition(":")
+                id2mwe_ranks[mwe_id].append(rank)
+                id2mwe_indexes[mwe_id].append(index)
+                if categ and ":" not in categ:  # (codes such as "1:VID:x" have no category)
+                    categ = curr_sent.check_and_convert_categ(categ)
+                    self.id2mwe_categ.setdefault(mwe_id, categ)
+        curr_sent.append_token(token)
 
     def __iter__(self):
+        if _fastio:
+            return _fastio.iter_sentences(self)
+        return self._iter_sentences()
+
+    def _iter_sentences(self):
+        r"""Yield all Sentence's in `self.fileobj` (mirrored in `_fastio.pyx`)."""
         with self.fileobj:
             yield from self.iter_header(self.fileobj)
-            for self.lineno, line in enumerate(self.fileobj, 1):
+            for self.lineno, line in enumerate(self.iter_lines(), 1):
                 try:
                     line = line.strip("\n")
                     if line.startswith("#"):
                         self.make_comment(line)
-                    elif not line.strip():
+                    elif not line or line.isspace():
                         if not self.curr_sent.empty():
                             yield self.finish_sentence()
                     else:
@@ -1423,6 +1954,36 @@ class AbstractFileIterator:
                 yield self.finish_sentence()
             yield from self.iter_footer(self.fileobj)
 
+    def iter_lines(self):
+        r"""Yield all lines in `self.fileobj` (may or may not end in "\n").
+        Regular files are memory-mapped and decoded one block of lines
+        (usually a whole sentence) at a time; other inputs are read line by line.
+        """
+        try:
+            mm = mmap.mmap(self.fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, io.UnsupportedOperation):
+            yield from self.fileobj  # e.g. pipes or empty files
+            return
+
+        with mm:
+            if mm.find(b"\r") != -1:
+                yield from self.fileobj  # let Python handle universal newlines
+                return
+            encoding, errors = self.fileobj.encoding, self.fileobj.errors
+            pos, size = 0, len(mm)
+            with memoryview(mm) as view:  # (blocks are decoded straight from the mapping, without copies)
+                while pos < size:
+                    end = mm.find(b"\n\n", pos)
+                    if end == -1:
+                        lines = str(view[pos:], encoding, errors).split("\n")
+                        if not lines[-1]:
+                            lines.pop()  # file ends in "\n"
+                        yield from lines
+                        return
+                    yield from str(view[pos:end], encoding, errors).split("\n")
+                    yield ""
+                    pos = end + 2
+
     def iter_header(self, f):
         return []  # Nothing to yield on header
 
@@ -1432,27 +1993,43 @@ class AbstractFileIterator:
 
 class ConlluIterator(AbstractFileIterator):
     UD_KEYS = 'ID FORM LEMMA UPOS XPOS FEATS HEAD DEPREL DEPS MISC'.split()
+    MAXSPLIT = len(UD_KEYS)
+    INTERNED_INDEXES = [i for (i, c) in enumerate(UD_KEYS) if c in AbstractFileIterator.INTERNED_COLNAMES]
+
     def __init__(self, corpusinfo, fileobj, default_mwe_category):
         corpusinfo.colnames = self.UD_KEYS
         super().__init__(corpusinfo, fileobj, default_mwe_category)
 
     def get_token_and_mwecodes(self, data):
         if len(data) != 10:
-            self.warn("CoNLL-U line has {n} columns, not 10", n=len(data))
-        return Token(zip(self.UD_KEYS, data)), []
+            self.warn("CoNLL-U line has {n} columns, not 10", n=self.n_columns(data))
+            data += [""] * (10 - len(data))  # (empty values are ignored by Token)
+        return Token.from_str_columns(self.UD_KEYS, data, self.INTERNED_INDEXES), ()
 
 
 class ConllupIterator(AbstractFileIterator):
+    # Tuple (colnames, colnames without PARSEME:MWE, index of PARSEME:MWE or None, INTERNED_COLNAMES indexes),
+    # recalculated whenever `corpusinfo.colnames` is replaced (see "# global.columns")
+    _colnames_info = (None, None, None, None)
+
     def get_token_and_mwecodes(self, data):
-        if len(data) != len(self.corpusinfo.colnames):
-            self.warn("Line has {n} columns, not {n_exp}", n=len(data), n_exp=len(self.corpusinfo.colnames))
-        tokendict = dict(zip(self.corpusinfo.colnames, data))
-        mwe_codes = tokendict.pop('PARSEME:MWE', "_")
-        m = mwe_codes.split(";") if mwe_codes not in "_*" else []
-        return Token(tokendict), m
+        colnames = self.corpusinfo.colnames
+        if len(data) != len(colnames):
+            self.warn("Line has {n} columns, not {n_exp}", n=len(data), n_exp=len(colnames))
+        if self._colnames_info[0] is not colnames:
+            i_mwe = colnames.index('PARSEME:MWE') if 'PARSEME:MWE' in colnames else None
+            token_colnames = [c for c in colnames if c != 'PARSEME:MWE']
+            interned_indexes = [i for (i, c) in enumerate(token_colnames) if c in self.INTERNED_COLNAMES]
+            self._colnames_info = (colnames, token_colnames, i_mwe, interned_indexes)
+        _, token_colnames, i_mwe, interned_indexes = self._colnames_info
+
+        mwe_codes = data.pop(i_mwe) if i_mwe is not None and i_mwe < len(data) else "_"
+        m = mwe_codes.split(";") if mwe_codes not in "_*" else ()
+        return Token.from_str_columns(token_colnames, data, interned_indexes), m
 
 
 class ParsemeTSVIterator(AbstractFileIterator):
+    MAXSPLIT = 5  # 4 columns (or 5, with XPOS)
     def __init__(self, corpusinfo, fileobj, default_mwe_category):
         #corpusinfo.colnames = ["ID", "FORM", "MISC", "PARSEME:MWE"]
         super().__init__(corpusinfo, fileobj, default_mwe_category)
@@ -1467,7 +2044,7 @@ class ParsemeTSVIterator(AbstractFileIterator):
                 "Considering 5th parsemetsv column as POS")
             #data.pop()  # remove data[-1]
         if len(data) != 4:
-            self.warn("PARSEMETSV line has {n} columns, not 4", n=len(data))
+            self.warn("PARSEMETSV line has {n} columns, not 4", n=self.n_columns(data))
         # ID FORM LEMMA UPOS XPOS FEATS HEAD DEPREL DEPS MISC
         conllu = {
             'ID': data[0],
@@ -1476,8 +2053,8 @@ class ParsemeTSVIterator(AbstractFileIterator):
             'XPOS': xpos,
         }
         mwe_codes = data[3]
-        m = mwe_codes.split(";") if mwe_codes not in "_*" else []
-        return Token(conllu), m
+        m = mwe_codes.split(";") if mwe_codes not in "_*" else ()
+        return Token.from_str_pairs(conllu.items()), m
 
 
 
@@ -1579,6 +2156,10 @@ def do_warn(msg_fmt, *, prefix=None, warntype=None, error=False, header=True, **
         exit(1)
 
 
+# Max number of worker processes used to parse input files in parallel (see `interpret_workers_request`)
+N_WORKERS = interpret_workers_request(os.getenv('PARSEME_WORKERS', '1'))
+
+
 ############################################################
 
 class InputContext:
@@ -1606,24 +2187,25 @@ def read_mwelexitems(iter_sentences):
     The first list concerns real MWEs, while the second concerns strictly NonVMWEs.
     """
     lf2mweoccurs = _lemmatizedform2mweoccurs(iter_sentences)  # type: dict[tuple[str], list[MWEOccur]]
-    lemmatizedform2mwe_mixed = collections.OrderedDict()  # type: dict[tuple[str], MWELexicalItem]
-    lemmatizedform2mwe_nvmwe = collections.OrderedDict()  # type: dict[tuple[str], MWELexicalItem]
+    mwes_mixed, mwes_nvmwe = [], []  # type: list[MWELexicalItem], list[MWELexicalItem]
 
-    for lemmatizedform, mweoccurs in lf2mweoccurs.items():
+    for mweoccurs in lf2mweoccurs.values():
         mwe = MWELexicalItem(mweoccurs)
         if mwe.only_non_vmwes():
-            lemmatizedform2mwe_nvmwe[lemmatizedform] = mwe
+            mwes_nvmwe.append(mwe)
         else:
-            lemmatizedform2mwe_mixed[lemmatizedform] = mwe
-    return (list(lemmatizedform2mwe_mixed.values()), list(lemmatizedform2mwe_nvmwe.values()))
+            mwes_mixed.append(mwe)
+    return (mwes_mixed, mwes_nvmwe)
 
 
 def _lemmatizedform2mweoccurs(iter_sentences):
-    r'''Return a dict[tuple[str], list[MWEOccur]].'''
+    r'''Return a dict[tuple[str], list[MWEOccur]].
+    Keys are the sorted lemmatized forms (MWEs with the same multiset of lemmas are grouped together).
+    '''
     ret = collections.defaultdict(list)  # type: dict[tuple[str], list[MWEOccur]]
     for sentence in iter_sentences:
         for mwe_occur in sentence.mweoccurs:
-            lemmatizedform = FrozenCounter(mwe_occur.reordered.likely_lemmatizedform)
+            lemmatizedform = tuple(sorted(mwe_occur.reordered.likely_lemmatizedform))
             ret[lemmatizedform].append(mwe_occur)
     return ret
 
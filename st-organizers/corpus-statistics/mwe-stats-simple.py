@@ -29,8 +29,8 @@ class Main:
                 or dataalign.calculate_conllu_paths(self.args.input, warn=False)
         for sentence in dataalign.IterAlignedFiles(self.args.lang,
                 self.args.input, self.conllu_paths, keep_nvmwes=False, debug=False):
-            for mweoccur in sentence.mweoccurs:
-                self.counter[mweoccur.category] += 1
+            if sentence.mweoccurs:
+                self.counter.update([mweoccur.category for mweoccur in sentence.mweoccurs])
             self.sents += 1
             self.tokens += len(sentence.tokens)
         #print("### {}".format(" ".join(self.args.input)))
@@ -7,6 +7,7 @@
 # Level 1 and level 2 from UD are used
 # Add tests on PARSEME:MWE column
 import sys
+import collections
 import io
 import subprocess
 import os.path
@@ -50,7 +51,7 @@ curr_line = 0 # Current line in the input file
 comment_start_line = 0 # The line in the input file on which the current sentence starts, including sentence-level comments.
 sentence_line = 0 # The line in the input file on which the current sentence starts (the first node/token line, skipping comments)
 sentence_id = None # The most recently read sentence id
-error_counter = {} # Incremented by warn()  {key: error type value: its count}
+error_counter = collections.Counter() # Incremented by warn()  {key: error type value: its count}
 tree_counter = 0  # number of trees
 
 
@@ -116,7 +117,7 @@ def warn(msg, error_type, testlevel=0, testid='some-test', lineno=True, noterr=F
     """
     global curr_fname, curr_line, sentence_line, sentence_id, error_counter, tree_counter, args
     if not noterr:
-        error_counter[error_type] = error_counter.get(error_type, 0)+1
+        error_counter[error_type] += 1
     # else:
     #     error_counter[error_type] = 0
         
@@ -823,7 +824,7 @@ def main():
     list_group.add_argument("--level", action="store", type=int, default=3, dest="level", help="The validation tests are organized to several levels. Level 1: Test only the CUPT backbone: order of lines, newline encoding, core tests that check the file integrity. Level 2: PARSEME and UD contents. Level 3: PARSEME releases: NotMWE tag excluded, more constraints on metadata.")
  
     args = opt_parser.parse_args() #Parsed command-line arguments
-    error_counter = {} # Incremented by warn()  {key: error type value: its count}
+    error_counter = collections.Counter() # Incremented by warn()  {key: error type value: its count}
     tree_counter = 0   # number of trees
     # Set of all valid languages in PARSEME corpora
     langs = load_languages_set('languages.code')
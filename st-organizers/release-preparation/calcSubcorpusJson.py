@@ -22,9 +22,15 @@ parser.add_argument("--input", type=str, required=True,
         help="""Path to input file (in some conllu-like format)""")
 
 
+RE_SENT_ID_LINE = re.compile('#.*sent_id.*=')
+RE_FINAL_NUMBER = re.compile(r"\d+$")
+
+
 class Main:
     def __init__(self, args):
         self.args = args
+        # Compiled once, as they are tried for every sentence
+        self.compiled_regexes = [(regex, re.compile(regex+'$')) for regex in self.args.regexes]
 
 
     def run(self):
@@ -33,7 +39,7 @@ class Main:
 
         with open(self.args.input) as fileobj:
             for line in fileobj:
-                if re.match('#.*sent_id.*=', line):
+                if line.startswith('#') and RE_SENT_ID_LINE.match(line):
                     sent_id = line.strip().split("=")[-1].split()[-1]
                     regex = self.calc_regex(sent_id)
                     if regex == last_regex:
@@ -57,10 +63,10 @@ class Main:
 
     def calc_regex(self, sent_id: str) -> str:
         r"""Return a regex that matches `sent_id`."""
-        for regex in self.args.regexes:
-            if re.match(regex+'$', sent_id):
+        for regex, compiled_regex in self.compiled_regexes:
+            if compiled_regex.match(sent_id):
                 return regex
-        return re.sub(r"\d+$", r"(\\d+)", sent_id)
+        return RE_FINAL_NUMBER.sub(r"(\\d+)", sent_id)
 
 
 def group(sent_id):
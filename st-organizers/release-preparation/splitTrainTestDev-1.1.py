@@ -1,9 +1,8 @@
 #! /usr/bin/env python3
 
 import argparse
-import collections
+import contextlib
 import json
-import subprocess
 
 import os, sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../lib"))
@@ -59,21 +58,25 @@ class Main:
                 regex=subcorpus.regex, ss=subcorpus.subsplit))
         print("IDEALLY-SPLIT-MWES: TOTAL: train={ss.train} test={ss.test} dev={ss.dev}".format(ss=split))
 
-        # Dedicate each sentence to one of {test,train,dev}
-        dedic_sents = []
-        for sent, subcorpus in self.iter_sentence_with_subcorpus(sents):
-            if subcorpus.taken_mwes.test < subcorpus.subsplit.test:
-                dedic_sents.append(DedicatedSentence(sent, 'test'))
-                subcorpus.taken_mwes.test += len(sent.mweoccurs)
-                subcorpus.taken_sents.test += 1
-            elif subcorpus.taken_mwes.dev < subcorpus.subsplit.dev:
-                dedic_sents.append(DedicatedSentence(sent, 'dev'))
-                subcorpus.taken_mwes.dev += len(sent.mweoccurs)
-                subcorpus.taken_sents.dev += 1
-            else:
-                dedic_sents.append(DedicatedSentence(sent, 'train'))
-                subcorpus.taken_mwes.train += len(sent.mweoccurs)
-                subcorpus.taken_sents.train += 1
+        # Dedicate each sentence to one of {test,train,dev} and print it
+        os.makedirs("./SPLIT", exist_ok=True)
+        with contextlib.ExitStack() as stack:
+            writers = {splittype: dataalign.ConllupWriter(
+                           output=stack.enter_context(open("./SPLIT/{}.cupt".format(splittype), "w+")))
+                       for splittype in 'test dev train'.split()}
+            for sent, subcorpus in self.iter_sentence_with_subcorpus(sents):
+                if subcorpus.taken_mwes.test < subcorpus.subsplit.test:
+                    writers['test'].write_sentences([sent])
+                    subcorpus.taken_mwes.test += len(sent.mweoccurs)
+                    subcorpus.taken_sents.test += 1
+                elif subcorpus.taken_mwes.dev < subcorpus.subsplit.dev:
+                    writers['dev'].write_sentences([sent])
+                    subcorpus.taken_mwes.dev += len(sent.mweoccurs)
+                    subcorpus.taken_sents.dev += 1
+                else:
+                    writers['train'].write_sentences([sent])
+                    subcorpus.taken_mwes.train += len(sent.mweoccurs)
+                    subcorpus.taken_sents.train += 1
 
         # Print TAKEN-{MWES,SENTS}
         for attrname in ['taken_mwes', 'taken_sents']:
@@ -89,13 +92,6 @@ class Main:
             print("{title}: TOTAL: train={tak.train} test={tak.test} dev={tak.dev}".format(
                 title=attrname.upper(), tak=total))
 
-        # Print sentences
-        subprocess.check_call("mkdir -p ./SPLIT", shell=True)
-        for splittype in 'test dev train'.split():
-            with open("./SPLIT/{}.cupt".format(splittype), "w+") as output:
-                dataalign.ConllupWriter(output=output).write_sentences([
-                    s for (s, stype) in dedic_sents if stype == splittype])
-
 
     def iter_sentence_with_subcorpus(self, sentences: list):
         r"""Yield (Sentence, Subcorpus) pairs."""
@@ -144,9 +140,6 @@ def decide_split(n_mwes: int) -> IntSplit:
     return IntSplit(train=n_mwes-2*tenth, test=tenth, dev=tenth)
 
 
-DedicatedSentence = collections.namedtuple('DedicatedSentence', 'sent dedicated_to')
-
-
 
 #####################################################
 
@@ -39,8 +39,8 @@ class Main:
             self.args.lang, self.args.input, self.conllu_paths,
             keep_nvmwes=(not self.args.discard_non_mwes), debug=self.args.debug)
 
-        colnames = self.args.colnames or iaf.aligned_iterator.main_iterators[0].corpusinfo.colnames
-        dataalign.ConllupWriter(colnames=colnames,keepranges=self.args.keepranges).write_sentences(iaf)
+        # (if colnames is None, the writer uses the colnames of the first input file)
+        dataalign.ConllupWriter(colnames=self.args.colnames,keepranges=self.args.keepranges).write_sentences(iaf)
 
 
 #####################################################
@@ -45,10 +45,14 @@ class Main:
 
         iaf = dataalign.IterAlignedFiles(
             self.args.lang, self.args.input, self.conllu_paths, keep_nvmwes=True, debug=False)
-        colnames = iaf.aligned_iterator.main_iterators[0].corpusinfo.colnames
-        doc.metadata['conllup-colnames'] = XML_CONLLUP_SEP.join(colnames)
+        colnames = None
 
         for tsv_sentence in iaf:
+            if colnames is None:
+                # Column names are only known after the input header has been parsed
+                colnames = tsv_sentence.corpusinfo.colnames
+                doc.metadata['conllup-colnames'] = XML_CONLLUP_SEP.join(colnames)
+
             folia_sentence = main_text.add(folia.Sentence)
             for tsv_w in tsv_sentence.tokens:
                 folia_w = folia_sentence.add(folia.Word, text=tsv_w["FORM"], space=(not tsv_w.nsp))
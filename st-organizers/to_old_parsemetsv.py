@@ -1,8 +1,8 @@
 #! /usr/bin/env python3
 
 import argparse
-import io
 import sys
+import shutil
 import subprocess
 
 import os, sys
@@ -36,15 +36,15 @@ class Main:
         self.conllu_paths = self.args.conllu or dataalign.calculate_conllu_paths(self.args.input)
         for sentence in dataalign.IterAlignedFiles(self.args.lang, self.args.input, self.conllu_paths,
                 keep_nvmwes=self.args.keep_non_vmwes, debug=self.args.debug):
-            for kv_pair in sentence.kv_pairs:
-                print(kv_pair.to_tsv())
+            lines = [kv_pair.to_tsv() for kv_pair in sentence.kv_pairs]
             for token, mwecodes in sentence.tokens_and_mwecodes():
                 surface_form = token.surface or dataalign.EMPTY
                 nsp = "nsp" if token.nsp else dataalign.EMPTY
                 mwe_ids = ";".join(mwecodes) or dataalign.EMPTY
                 self.counter_increment(mwecodes)
-                print(token.rank, surface_form, nsp, mwe_ids, sep="\t")
-            print()
+                lines.append("\t".join((token.rank, surface_form, nsp, mwe_ids)))
+            lines.append("")
+            sys.stdout.write("\n".join(lines) + "\n")  # (one write per sentence)
         self.counter_print()
         self.tgz_end()
 
@@ -66,8 +66,8 @@ class Main:
         
     def tgz_begin(self):
         if self.args.tgz:
-            shell("rm -rf /tmp/parsemetgz")
-            shell("mkdir -p /tmp/parsemetgz")
+            shutil.rmtree("/tmp/parsemetgz", ignore_errors=True)
+            os.makedirs("/tmp/parsemetgz")
             sys.stdout = open("/tmp/parsemetgz/data.parsemetsv", "w+")
             sys.stderr = Tee(sys.stderr, open("/tmp/parsemetgz/STDERR", "w+"))
 
@@ -76,6 +76,7 @@ class Main:
             from pipes import quote
             sys.stdin.close()
             sys.stdout.close()
+            sys.stderr.flush()
             if self.conllu_paths:
                 shell("cat {} >/tmp/parsemetgz/data.conllu"
                         .format(" ".join(quote(c) for c in self.conllu_paths)))
@@ -90,15 +91,17 @@ def shell(cmd):
     subprocess.check_call(cmd, shell=True)
 
 
-class Tee(io.TextIOWrapper):
-    r"""Same as a unix `tee`"""
-    def __init__(self, main_fileobj, other_fileobj):
-        self.fileobjs = [main_fileobj, other_fileobj]
-        super().__init__(main_fileobj)
+class Tee:
+    r"""Same as a unix `tee` (for text file objects)"""
+    def __init__(self, *fileobjs):
+        self.fileobjs = fileobjs
 
     def write(self, data):
         for fileobj in self.fileobjs:
             fileobj.write(data)
+
+    def flush(self):
+        for fileobj in self.fileobjs:
             fileobj.flush()
 
 
@@ -0,0 +1,267 @@
+#! /usr/bin/env python3
+
+import unittest
+import contextlib
+import difflib
+import glob
+import io
+import random
+import tempfile
+import sys, os
+
+#to get the current working directory
+CURRENT_DIRECTORY = os.getcwd()
+DIR_LIB = f'{CURRENT_DIRECTORY}/lib'
+sys.path.append(DIR_LIB)
+import dataalign
+
+
+class TestMatchingBlocks(unittest.TestCase):
+
+    def assert_same_as_difflib(self, seq_a, seq_b):
+        expected = [tuple(m) for m in difflib.SequenceMatcher(None, seq_a, seq_b).get_matching_blocks()]
+        self.assertEqual([tuple(m) for m in dataalign.matching_blocks(seq_a, seq_b)], expected)
+
+    def test_matching_blocks_simple(self):
+        self.assert_same_as_difflib([], [])
+        self.assert_same_as_difflib("a b c".split(), [])
+        self.assert_same_as_difflib("a b c".split(), "a b c".split())
+        self.assert_same_as_difflib("a b c".split(), "a b".split())
+        self.assert_same_as_difflib("do n't go".split(), "do not go".split())
+        self.assert_same_as_difflib("vamos à praia".split(), "vamos a a praia".split())
+
+    def test_matching_blocks_random(self):
+        rnd = random.Random(42)
+        for _ in range(2000):
+            seq_a = [rnd.randint(0, 5) for _ in range(rnd.randint(0, 30))]
+            seq_b = [rnd.randint(0, 5) for _ in range(rnd.randint(0, 30))]
+            self.assert_same_as_difflib(seq_a, seq_b)
+
+    def test_numba_same_as_difflib(self):
+        # Same as above, calling `_align_numba` directly (`dataalign.matching_blocks` may use difflib)
+        align_numba = dataalign._import_align_numba()
+        if align_numba is None:
+            self.skipTest("Numba is not installed")
+        rnd = random.Random(42)
+        for _ in range(2000):
+            seq_a = [rnd.randint(0, 5) for _ in range(rnd.randint(0, 30))]
+            seq_b = [rnd.randint(0, 5) for _ in range(rnd.randint(0, 30))]
+            expected = [tuple(m) for m in difflib.SequenceMatcher(None, seq_a, seq_b).get_matching_blocks()]
+            self.assertEqual(align_numba.matching_blocks(seq_a, seq_b), expected)
+
+
+class TestPaths(unittest.TestCase):
+
+    def test_basename_without_ext(self):
+        self.assertEqual(dataalign.basename_without_ext("data/pt.folia.xml"), "pt")
+        self.assertEqual(dataalign.basename_without_ext("a/b/x.y.cupt.gz"), "x.y")
+        self.assertEqual(dataalign.basename_without_ext("a.b..tsv"), "a.b.")
+        self.assertEqual(dataalign.basename_without_ext("dir.xml/train"), "train")
+        self.assertEqual(dataalign.basename_without_ext(".conllu"), "")
+
+
+class TestFileIterator(unittest.TestCase):
+
+    def assert_same_lines(self, content):
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="", delete=False) as f:
+            f.write(content)
+        try:
+            with open(f.name, encoding="utf-8") as fileobj:
+                expected = [line.strip("\n") for line in fileobj]
+            iterator = dataalign.ConlluIterator(
+                dataalign.CorpusInfo("EN", f.name, None), open(f.name, encoding="utf-8"), None)
+            with iterator.fileobj:
+                self.assertEqual([line.strip("\n") for line in iterator.iter_lines()], expected)
+        finally:
+            os.remove(f.name)
+
+    def test_iter_lines(self):
+        self.assert_same_lines("")
+        self.assert_same_lines("1\ta\n2\tb\n\n1\tc\n")
+        self.assert_same_lines("# x\n1\ta\n\n\n\n1\tb")
+        self.assert_same_lines("\n\n1\tá\n \n\n")
+        self.assert_same_lines("1\ta\r\n\r\n1\tb\r\n")
+
+
+    def test_n_columns_warning(self):
+        iterator = dataalign.ConlluIterator(dataalign.CorpusInfo("EN", "x.conllu", None), None, None)
+        for n_columns in [9, 11, 12]:
+            line = "\t".join(["1", "a"] + ["_"] * (n_columns - 2))
+            with contextlib.redirect_stderr(io.StringIO()) as stderr:
+                iterator.append_token(line)
+            self.assertIn("has {} columns, not 10".format(n_columns), stderr.getvalue())
+
+        iterator = dataalign.ParsemeTSVIterator(dataalign.CorpusInfo("EN", "x.parsemetsv", None), None, None)
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            iterator.append_token("1\ta\t_\t_\tX\t_\t_")
+        self.assertIn("has 7 columns, not 4", stderr.getvalue())
+
+
+class TestFastio(unittest.TestCase):
+    # `_fastio.pyx` mirrors `AbstractFileIterator._iter_sentences` (built with `lib/build_fastio.py`)
+
+    def setUp(self):
+        if dataalign._fastio is None:
+            self.skipTest("_fastio is not built")
+
+    def read_all(self, path):
+        dataalign._WARNED.clear()  # (so that `warn_once` warnings are printed on every read)
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            if path.endswith(".conllu"):
+                sentences = list(dataalign._iter_conllu_file("PT", path, None))
+            else:
+                sentences = list(dataalign.IterAlignedFiles("PT", [path]))
+        return [([dict(t) for t in sent.tokens], [(m.indexes, m.category) for m in sent.mweoccurs],
+                 [kv.to_tsv() for kv in sent.kv_pairs]) for sent in sentences], stderr.getvalue()
+
+    def assert_same_as_pure_python(self, path):
+        compiled = self.read_all(path)
+        old_fastio, dataalign._fastio = dataalign._fastio, None
+        try:
+            self.assertEqual(compiled, self.read_all(path))
+        finally:
+            dataalign._fastio = old_fastio
+
+    def test_same_as_pure_python(self):
+        for ext in ["cupt", "conllu", "conllup", "parsemetsv"]:
+            for path in sorted(glob.glob(f'{CURRENT_DIRECTORY}/test/data/*.{ext}')):
+                with self.subTest(path=path):
+                    self.assert_same_as_pure_python(path)
+
+    def test_same_as_pure_python_edge_cases(self):
+        content = ("# global.columns = ID FORM LEMMA UPOS XPOS FEATS HEAD DEPREL DEPS MISC PARSEME:MWE\n"
+                   "# sent_id = 1\n1\ta\t_\t_\t_\t_\t_\t_\t_\t_\t1:VID\n"
+                   "2\tb\t_\t_\t_\t_\t_\t_\t_\tSpaceAfter=No\t1\n3\tc\t_\n \n\n"
+                   "# x = y\n1\td\t_\t_\t_\t_\t_\t_\t_\t_\t*\textra\n")
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".cupt", delete=False) as f:
+            f.write(content)
+        try:
+            self.assert_same_as_pure_python(f.name)
+        finally:
+            os.remove(f.name)
+
+
+class TestMWEOccur(unittest.TestCase):
+
+    def test_views_debug_checks(self):
+        # The MWEOccurView invariants are only asserted when PARSEME_DEBUG is set
+        path = f'{CURRENT_DIRECTORY}/test/data/pt.cupt'
+        old_debug_checks, dataalign.DEBUG_CHECKS = dataalign.DEBUG_CHECKS, True
+        try:
+            mweoccurs = [m for sent in dataalign.IterAlignedFiles("PT", [path]) for m in sent.mweoccurs]
+        finally:
+            dataalign.DEBUG_CHECKS = old_debug_checks
+        self.assertTrue(any(m.category == "IRV" for m in mweoccurs))
+        self.assertTrue(any(m.category.startswith("LVC.") for m in mweoccurs))
+
+
+class TestAlignedIterator(unittest.TestCase):
+
+    def aligned_sentences(self, n_pairs, n_workers):
+        main_path = f'{CURRENT_DIRECTORY}/test/data/pt_OLD.parsemetsv'
+        conllu_path = f'{CURRENT_DIRECTORY}/test/data/pt_OLD.conllu'
+        old_n_workers, dataalign.N_WORKERS = dataalign.N_WORKERS, n_workers
+        try:
+            return [([dict(t) for t in sent.tokens], [(m.indexes, m.category) for m in sent.mweoccurs])
+                    for sent in dataalign.IterAlignedFiles("PT", [main_path]*n_pairs, [conllu_path]*n_pairs)]
+        finally:
+            dataalign.N_WORKERS = old_n_workers
+
+    def test_workers_request(self):
+        self.assertEqual(dataalign.interpret_workers_request("3"), 3)
+        self.assertGreaterEqual(dataalign.interpret_workers_request("0"), 1)
+        for workers_req in ["", "auto", "-1"]:
+            with contextlib.redirect_stderr(io.StringIO()) as stderr:
+                self.assertEqual(dataalign.interpret_workers_request(workers_req), 1)
+            self.assertIn("Ignoring PARSEME_WORKERS", stderr.getvalue())
+
+    def test_file_pairs(self):
+        expected = self.aligned_sentences(1, 1) * 3
+        self.assertEqual(self.aligned_sentences(3, 1), expected)
+        self.assertEqual(self.aligned_sentences(3, 2), expected)
+
+    def test_multiple_conllu_paths(self):
+        # Callers such as checkSentenceMatching.py need the `main`/`conllu` sentence iterators
+        main_path = f'{CURRENT_DIRECTORY}/test/data/pt_OLD.parsemetsv'
+        conllu_path = f'{CURRENT_DIRECTORY}/test/data/pt_OLD.conllu'
+        aligned = dataalign.AlignedIterator.from_paths("PT", [main_path]*2, [conllu_path]*2)
+        sent_aligner = dataalign.SentenceAligner(aligned.main, aligned.conllu)
+        self.assertEqual(len(sent_aligner.main_sentences), len(sent_aligner.conllu_sentences))
+        self.assertEqual(len(sent_aligner.main_sentences), 2 * len(self.aligned_sentences(1, 1)))
+
+    def test_iterate_twice(self):
+        path = f'{CURRENT_DIRECTORY}/test/data/pt.cupt'
+        iaf = dataalign.IterAlignedFiles("PT", [path])
+        first = [[dict(t) for t in sent.tokens] for sent in iaf]
+        self.assertTrue(first)
+        self.assertEqual([[dict(t) for t in sent.tokens] for sent in iaf], first)
+
+
+    def test_bad_path(self):
+        with self.assertRaises(FileNotFoundError):
+            dataalign.IterAlignedFiles("PT", [f'{CURRENT_DIRECTORY}/test/data/nonexistent.cupt'])
+
+
+class TestFoliaIterator(unittest.TestCase):
+
+    def sentences(self, path, method_name):
+        with open(path, encoding="utf-8") as fileobj:
+            iterator = dataalign.FoliaIterator(dataalign.CorpusInfo("PT", path, None), fileobj)
+            return list(getattr(iterator, method_name)(fileobj.read()))
+
+    def test_streamed_same_as_folia_document(self):
+        path = f'{CURRENT_DIRECTORY}/test/data/pt2.folia.xml'
+        streamed = self.sentences(path, "_iter_streamed")
+        expected = self.sentences(path, "_iter_folia_document")
+        self.assertEqual(len(streamed), len(expected))
+        for sent, sent_exp in zip(streamed, expected):
+            self.assertEqual([dict(t) for t in sent.tokens], [dict(t) for t in sent_exp.tokens])
+            self.assertEqual([(m.indexes, m.category, m.metadata.generic_properties()) for m in sent.mweoccurs],
+                             [(m.indexes, m.category, m.metadata.generic_properties()) for m in sent_exp.mweoccurs])
+            self.assertEqual([kv.to_tsv() for kv in sent.kv_pairs], [kv.to_tsv() for kv in sent_exp.kv_pairs])
+
+    def iter_modified(self, path, old, new):
+        r"""Iterate over `path` with the last occurrence of `old` replaced by `new`."""
+        with open(path, encoding="utf-8") as fileobj:
+            before, after = fileobj.read().rsplit(old, 1)
+        with tempfile.NamedTemporaryFile("w+", encoding="utf-8", suffix=".folia.xml") as fileobj:
+            fileobj.write(before + new + after)
+            fileobj.flush()
+            fileobj.seek(0)
+            return list(dataalign.FoliaIterator(dataalign.CorpusInfo("PT", path, None), fileobj))
+
+    def test_not_streamable_header(self):
+        path = f'{CURRENT_DIRECTORY}/test/data/pt2.folia.xml'
+        sentences = self.iter_modified(path, '<pos-annotation ', '<pos-annotation annotator="x" ')
+        expected = self.sentences(path, "_iter_folia_document")
+        self.assertEqual([[dict(t) for t in sent.tokens] for sent in sentences],
+                         [[dict(t) for t in sent.tokens] for sent in expected])
+
+    def test_not_streamable_sentence(self):
+        # Only the last sentence has a non-current <t>, so the sentences before it are streamed
+        path = f'{CURRENT_DIRECTORY}/test/data/pt2.folia.xml'
+        sentences = self.iter_modified(path, '<t>.</t>', '<t>.</t><t class="original">!</t>')
+        expected = self.sentences(path, "_iter_folia_document")
+        self.assertEqual([[dict(t) for t in sent.tokens] for sent in sentences],
+                         [[dict(t) for t in sent.tokens] for sent in expected])
+        self.assertEqual([sent.nth_sent for sent in sentences], list(range(1, len(expected) + 1)))
+
+    def test_iter_is_lazy(self):
+        path = f'{CURRENT_DIRECTORY}/test/data/pt2.folia.xml'
+        with open(path, encoding="utf-8") as fileobj:
+            iterator = iter(dataalign.FoliaIterator(dataalign.CorpusInfo("PT", path, None), fileobj))
+            self.assertEqual(fileobj.tell(), 0)
+            self.assertFalse(fileobj.closed)
+            self.assertTrue(next(iterator).tokens)
+
+    def test_iter_memory_mapped(self):
+        path = f'{CURRENT_DIRECTORY}/test/data/pt2.folia.xml'
+        with open(path, encoding="utf-8") as fileobj:
+            streamed = list(dataalign.FoliaIterator(dataalign.CorpusInfo("PT", path, None), fileobj))
+        expected = self.sentences(path, "_iter_folia_document")
+        self.assertEqual([[dict(t) for t in sent.tokens] for sent in streamed],
+                         [[dict(t) for t in sent.tokens] for sent in expected])
+
+
+if __name__ == '__main__':
+    unittest.main()